@@ -1,10 +1,52 @@
 # -*- coding: utf-8 -*-
 """Módulo para cargar modelos de IA."""
 
+import os
 import torch
+import weakref
+from importlib import metadata
 from ultralytics import YOLO
 from facenet_pytorch import MTCNN, InceptionResnetV1
 
+def _facenet_pytorch_version():
+    """
+    Obtiene la versión instalada de facenet-pytorch.
+    
+    Returns:
+        str: Versión, o "desconocida" si no se puede determinar
+    """
+    try:
+        return metadata.version("facenet-pytorch")
+    except metadata.PackageNotFoundError:
+        return "desconocida"
+
+# FaceNet compilado con TorchScript; se genera una vez por dispositivo (en CPU, cuantizado a int8).
+# La carpeta depende de las versiones de torch y facenet-pytorch para no cargar un
+# artefacto generado por otra versión
+FACENET_TS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "torchscript",
+    f"torch-{torch.__version__}_facenet-{_facenet_pytorch_version()}"
+)
+FACENET_TS_PATH = os.path.join(FACENET_TS_DIR, "facenet_ts_{variant}.pt")
+
+# Variante con la que se cargó cada FaceNet, para no mezclar embeddings de modelos distintos
+_FACENET_VARIANTS = weakref.WeakKeyDictionary()
+
+def facenet_variant(facenet):
+    """
+    Identifica la variante de un FaceNet cargado con ModelLoader.
+    
+    Args:
+        facenet: Modelo FaceNet
+        
+    Returns:
+        str: Variante (dispositivo, cuantización, compilación y versiones), o None si no se conoce
+    """
+    try:
+        return _FACENET_VARIANTS.get(facenet)
+    except TypeError:
+        return None
+
 class ModelLoader:
     """Clase para cargar y gestionar modelos de IA."""
     
@@ -37,14 +79,82 @@ class ModelLoader:
             )
             
             print("Cargando FaceNet...")
-            self.facenet = InceptionResnetV1(
-                pretrained='vggface2',
-                device=self.device
-            ).eval()
+            self.facenet = self.load_facenet()
             
             print("Modelos cargados correctamente")
             return self.yolo, self.mtcnn, self.facenet, self.device
             
         except Exception as e:
             print(f"Error al cargar modelos: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def load_facenet(self):
+        """
+        Carga FaceNet compilado con TorchScript (congelado y optimizado para inferencia).
+        
+        En CPU las capas Linear se cuantizan dinámicamente a int8 antes de compilar.
+        El modelo compilado se guarda en disco la primera vez y se reutiliza en
+        los siguientes arranques; si la compilación falla se usa el modelo normal.
+        
+        Returns:
+            torch.nn.Module: Modelo FaceNet listo para inferencia
+        """
+        quantize = self.device == 'cpu'
+        variant = 'cpu_int8' if quantize else self.device
+        ts_path = FACENET_TS_PATH.format(variant=variant)
+        if os.path.exists(ts_path):
+            try:
+                return self._register_variant(torch.jit.load(ts_path, map_location=self.device), variant)
+            except Exception as e:
+                print(f"No se pudo cargar {ts_path}, se vuelve a generar: {e}")
+        
+        facenet = InceptionResnetV1(
+            pretrained='vggface2',
+            device=self.device
+        ).eval()
+        
+        if quantize:
+            try:
+                if 'fbgemm' in torch.backends.quantized.supported_engines:
+                    torch.backends.quantized.engine = 'fbgemm'
+                facenet = torch.quantization.quantize_dynamic(
+                    facenet, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            except Exception as e:
+                print(f"No se pudo cuantizar FaceNet, se usa FP32: {e}")
+                variant = self.device
+                ts_path = FACENET_TS_PATH.format(variant=variant)
+        
+        try:
+            # El forward no tiene control de flujo dependiente de los datos: basta con trazarlo
+            example = torch.zeros(1, 3, 160, 160, device=self.device)
+            with torch.no_grad():
+                traced = torch.jit.trace(facenet, example)
+            optimized = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+        except Exception as e:
+            print(f"No se pudo compilar FaceNet con TorchScript, se usa el modelo normal: {e}")
+            return self._register_variant(facenet, f"{variant}_eager")
+        
+        # Si no se puede guardar (carpeta de solo lectura, constantes no serializables)
+        # se usa igualmente el modelo compilado; solo se repetirá la compilación
+        try:
+            os.makedirs(FACENET_TS_DIR, exist_ok=True)
+            torch.jit.save(optimized, ts_path)
+        except Exception as e:
+            print(f"No se pudo guardar {ts_path}: {e}")
+        return self._register_variant(optimized, variant)
+    
+    @staticmethod
+    def _register_variant(facenet, variant):
+        """
+        Registra la variante de un FaceNet cargado para consultarla con facenet_variant.
+        
+        Args:
+            facenet: Modelo FaceNet
+            variant (str): Dispositivo y cuantización del modelo
+            
+        Returns:
+            Modelo recibido, sin cambios
+        """
+        _FACENET_VARIANTS[facenet] = f"{os.path.basename(FACENET_TS_DIR)}/{variant}"
+        return facenet
@@ -62,7 +62,8 @@ class PersonDatabase:
                 facultad_path = os.path.join(BASE_PATH, facultad)
                 if os.path.isdir(facultad_path):
                     for person in os.listdir(facultad_path):
-                        if os.path.isdir(os.path.join(facultad_path, person)):
+                        # Los directorios ocultos son registros a medio guardar (.registro_*)
+                        if not person.startswith('.') and os.path.isdir(os.path.join(facultad_path, person)):
                             total_people += 1
             
             if total_people == 0:
@@ -86,7 +87,7 @@ class PersonDatabase:
                         break
                         
                     person_path = os.path.join(facultad_path, person)
-                    if not os.path.isdir(person_path):
+                    if person.startswith('.') or not os.path.isdir(person_path):
                         continue
                     
                     print(f"Procesando persona: {person}")
@@ -20,7 +20,7 @@ from PyQt6.QtWidgets import (
     QLineEdit, QFormLayout, QScrollArea, QDialog, QFileDialog, QMessageBox,
     QSizePolicy, QSplitter  # Añadimos estas clases para el responsive
 )
-from PyQt6.QtCore import Qt, QTimer, QSize, QRect
+from PyQt6.QtCore import Qt, QTimer, QSize, QRect, QCoreApplication, QEventLoop
 from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QFont, QTextCharFormat, QTextCursor, QAction, QResizeEvent
 
 from config.constants import BASE_PATH, VERSION, TARGET_FPS, SEDES
@@ -68,6 +68,7 @@ class AccessControlSystem(QMainWindow):
         self.detection_cooldown = 3.0  # Segundos entre detecciones para evitar duplicados
         self.process_every_n_frames = 2  # Procesar solo cada n frames para mejor rendimiento
         self.frame_count = 0
+        self._bgr_buf = None  # Buffer de captura reutilizable, se asigna al abrir la cámara
         self.current_layout_mode = "default"  # Para controlar la disposición según el tamaño
 
         self.camera_settings = {
@@ -77,6 +78,11 @@ class AccessControlSystem(QMainWindow):
         'detection_cooldown': 3.0
         }
 
+        # Constantes de captura precargadas para el camino de inicio/parada
+        self._fps = TARGET_FPS
+        self._timer_interval = 1000 // TARGET_FPS
+        self._w, self._h = self._parse_resolution(self.camera_settings['resolution'])
+
         # Inicializar componentes de datos
         self.database_manager = PersonDatabase(mtcnn, facenet)
         self.person_database = self.database_manager.load_database(self)
@@ -202,6 +208,15 @@ class AccessControlSystem(QMainWindow):
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)  # Centrar el contenido
         video_layout.addWidget(self.video_label)
         
+        # Imagen pre-renderizada que se muestra al detener el monitoreo
+        self.stopped_pixmap = QPixmap(640, 480)
+        self.stopped_pixmap.fill(QColor(30, 30, 30))
+        painter = QPainter(self.stopped_pixmap)
+        painter.setPen(QColor(255, 255, 255))
+        painter.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        painter.drawText(self.stopped_pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "Monitoreo detenido")
+        painter.end()
+        
         # Información de detección
         self.detection_info = QLabel("Esperando detecciones...")
         self.detection_info.setStyleSheet("""
@@ -1015,6 +1030,7 @@ class AccessControlSystem(QMainWindow):
                 }
             
                 # Actualizar variables de la clase
+                self._w, self._h = self._parse_resolution(self.camera_settings['resolution'])
                 self.process_every_n_frames = new_settings.get('process_every_n_frames', 2)
                 self.detection_cooldown = new_settings.get('detection_cooldown', 3.0)
             
@@ -1339,7 +1355,7 @@ class AccessControlSystem(QMainWindow):
         if self.frame_count % self.process_every_n_frames != 0:
             return
             
-        ret, frame = self.camera.read()
+        ret, frame = self.camera.read(self._bgr_buf)
         if ret:
             # Enviar el frame al procesador en segundo plano
             self.frame_processor.add_frame(frame)
@@ -1353,18 +1369,19 @@ class AccessControlSystem(QMainWindow):
             identity: Identidad reconocida (o None)
             confidence: Nivel de confianza del reconocimiento
         """
-        # Actualizar la interfaz de usuario con el frame procesado
-        rgb_frame = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
+        # Actualizar la interfaz de usuario con el frame procesado (Qt lee BGR directamente).
+        # QImage envuelve el buffer sin copiarlo; display_frame sigue vivo hasta fromImage
+        display_frame = np.ascontiguousarray(display_frame)
+        h, w, ch = display_frame.shape
         bytes_per_line = ch * w
-        qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+        qt_image = QImage(display_frame.data, w, h, bytes_per_line, QImage.Format.Format_BGR888)
         
         # Adaptar la imagen al tamaño actual del contenedor manteniendo la proporción
         pixmap = QPixmap.fromImage(qt_image)
         scaled_pixmap = pixmap.scaled(
             self.video_label.size(), 
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            Qt.TransformationMode.FastTransformation  # Vista en vivo: prima la velocidad
         )
         self.video_label.setPixmap(scaled_pixmap)
             
@@ -1576,33 +1593,56 @@ class AccessControlSystem(QMainWindow):
         """Guarda el log en un archivo."""
         self.logger.save_log(self)
 
+    @staticmethod
+    def _parse_resolution(resolution_str):
+        """
+        Convierte una cadena de resolución en una tupla (ancho, alto).
+        
+        Args:
+            resolution_str (str): Resolución en formato 'ANCHOxALTO'
+            
+        Returns:
+            tuple: (ancho, alto), o (1280, 720) si la cadena no es válida
+        """
+        try:
+            width, height = map(int, resolution_str.split('x'))
+            return width, height
+        except Exception:
+            return 1280, 720  # Valor predeterminado
+
     def toggle_camera(self):
         """Activa o desactiva la cámara."""
         if not self.is_camera_running:
             try:
                 # Obtener el índice de cámara de la configuración
                 camera_index = self.camera_settings.get('camera_index', 0)
-            
-                # Obtener la resolución de la configuración
-                resolution_str = self.camera_settings.get('resolution', '1280x720')
-                try:
-                    width, height = map(int, resolution_str.split('x'))
-                    resolution = (width, height)
-                except Exception:
-                    resolution = (1280, 720)  # Valor predeterminado
+                fps, width, height = self._fps, self._w, self._h
             
                 # Usar el método optimizado para abrir la cámara
-                self.camera = open_fastest_webcam(camera_index, resolution=resolution, target_fps=TARGET_FPS)
+                self.camera = open_fastest_webcam(camera_index, resolution=(width, height), target_fps=fps)
             
                 if self.camera is not None and self.camera.isOpened():
+                    # Reservar una sola vez el buffer de captura
+                    cam_w = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+                    cam_h = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+                    self._bgr_buf = np.empty((cam_h, cam_w, 3), np.uint8)
+                
+                    # No leer más rápido de lo que entrega la cámara (mínimo 15 FPS por si reporta menos)
+                    cam_fps = self.camera.get(cv2.CAP_PROP_FPS)
+                    interval = self._timer_interval
+                    if cam_fps > 0:
+                        interval = max(interval, 1000 // max(int(cam_fps), 15))
+                
                     # Iniciar el procesador de frames si no está activo
                     if not self.frame_processor.isRunning():
                         self.frame_processor.start()
                 
-                    self.timer.start(1000 // TARGET_FPS)  # Actualizar a la frecuencia objetivo
+                    self.timer.start(interval)  # Actualizar al ritmo real de la cámara
                     self.is_camera_running = True
                     self.start_button.setText("⏹ Detener Monitoreo")
-                    self.logger.log_message(f"🎥 Monitoreo iniciado a {TARGET_FPS} FPS con Cámara {camera_index}")
+                    self.logger.log_message(
+                        f"🎥 Monitoreo iniciado a {fps} FPS con Cámara {camera_index} ({width}x{height})"
+                    )
                 
                     # Actualizar status bar
                     self.update_stats()
@@ -1615,14 +1655,17 @@ class AccessControlSystem(QMainWindow):
                 traceback.print_exc()
         else:
             self.timer.stop()
+            # Procesar eventos pendientes del timer antes de liberar la cámara
+            QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
             if self.camera is not None:
                 self.camera.release()
                 self.camera = None
+            self._bgr_buf = None
         
             # No detener el procesador de frames, solo dejamos de enviarle frames
             self.is_camera_running = False
             self.start_button.setText("🎥 Iniciar Monitoreo")
-            self.video_label.clear()
+            self.video_label.setPixmap(self.stopped_pixmap)
             self.detection_info.setText("Esperando detecciones...")
             self.logger.log_message("⏹ Monitoreo detenido")
         
@@ -1631,7 +1674,31 @@ class AccessControlSystem(QMainWindow):
         
             # Liberar memoria
             gc.collect()
-            torch.cuda.empty_cache() if torch.cuda.is_available() else None
+            self._maybe_trim_cache()
+
+    def _should_trim_cache(self):
+        """
+        Indica si la caché de CUDA está lo bastante fragmentada para liberarla.
+        
+        Returns:
+            bool: True si menos de la mitad de la memoria reservada está en uso
+                  y la reserva supera los 512 MB
+        """
+        snap = torch.cuda.memory_snapshot()
+        total = sum(b['total_size'] for b in snap) or 1
+        alloc = sum(b['allocated_size'] for b in snap)
+        return alloc / total < 0.5 and total > 512 * 1024 * 1024
+
+    def _maybe_trim_cache(self):
+        """Libera la caché de CUDA solo cuando hay fragmentación real."""
+        if not torch.cuda.is_available() or not str(self.device).startswith('cuda'):
+            return
+        try:
+            if self._should_trim_cache():
+                with torch.cuda.device(self.device):
+                    torch.cuda.empty_cache()
+        except Exception as e:
+            print(f"Error al liberar caché de CUDA: {str(e)}")
 
     def closeEvent(self, event):
         """Limpia los recursos antes de cerrar la aplicación."""
@@ -1643,11 +1710,8 @@ class AccessControlSystem(QMainWindow):
             if self.camera is not None:
                 self.camera.release()
                 self.camera = None
-                
-            # Liberar memoria
-            gc.collect()
-            torch.cuda.empty_cache() if torch.cuda.is_available() else None
             
+            # No se libera memoria aquí: el sistema operativo la recupera al salir
             event.accept()
         except Exception as e:
             print(f"Error al cerrar aplicación: {str(e)}")
@@ -2,23 +2,26 @@
 """Módulo para el diálogo de registro de personas."""
 
 import os
-import gc
 import cv2
 import json
 import torch
 import shutil
-import uuid
+import tempfile
 import traceback
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from types import MappingProxyType
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QFormLayout, QGroupBox, QPushButton, QComboBox, QMessageBox,
-    QFileDialog, QProgressDialog, QScrollArea, QWidget, QInputDialog,
+    QFileDialog, QProgressDialog, QListView, QAbstractItemView, QWidget, QInputDialog,
     QTabWidget, QSizePolicy, QCheckBox  # Añadimos QCheckBox para opción de ID automático
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QFont
+from PyQt6.QtCore import (
+    Qt, QTimer, QSize, QAbstractListModel, QModelIndex, QThread, QSignalBlocker, pyqtSignal
+)
+from PyQt6.QtGui import QImage, QPixmap, QPixmapCache, QPainter, QColor, QFont
 
 # Esta importación puede fallar si se ejecuta el archivo directamente
 try:
@@ -30,9 +33,787 @@ except ImportError:
     SEDES = ["Fusagasugá", "Girardot", "Ubaté", "Facatativá", "Chía", "Chocontá", "Zipaquirá", "Soacha"]
     EXTENSIONES_CARRERAS = {}
 
+# orjson es opcional; si no está instalado se usa el módulo json estándar
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# simplejpeg es opcional; codifica con libjpeg-turbo más rápido que cv2.imencode
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# faiss es opcional; acelera la búsqueda del rostro más parecido con muchas personas
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Identificador de la variante de FaceNet; no disponible si no se pueden importar los modelos
+try:
+    from ai.model_loader import facenet_variant
+except ImportError:
+    facenet_variant = None
+
+from utils.camera import CameraWorker, open_fastest_webcam
+
+# Tamaño fijo de la vista previa; la cámara se configura a la misma resolución
+PREVIEW_WIDTH, PREVIEW_HEIGHT = 640, 480
+
+# Lado mayor de la imagen usada para detectar rostros con MTCNN al capturar
+MTCNN_MAX_SIDE = 320
+
+# Extensiones de imagen aceptadas al cargar un dataset
+VALID_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
+
+# Tamaño a partir del cual una imagen del dataset se decodifica a media resolución
+LARGE_IMAGE_BYTES = 1_000_000
+
+# Índice con la metadata de todas las personas registradas, para no abrir cada info.json
+PEOPLE_INDEX_PATH = os.path.join(BASE_PATH, ".personas_index.json")
+
+# Caché en disco de los embeddings de las personas registradas
+EMBEDDINGS_CACHE_PATH = os.path.join(BASE_PATH, ".embeddings_cache.npz")
+
+# Umbral de similitud para considerar un rostro duplicado: 1 - distancia/2 > 0.7,
+# es decir, distancia euclidiana < 0.6. Entre vectores unitarios d² = 2 - 2·cos,
+# así que equivale a una similitud coseno mayor que 1 - 0.6²/2 = 0.82
+FACE_MATCH_SIMILARITY = 0.7
+FACE_MATCH_COSINE = 1.0 - (2.0 * (1.0 - FACE_MATCH_SIMILARITY)) ** 2 / 2.0
+
+# Rostros por lote al extraer embeddings de FaceNet
+EMBEDDING_BATCH_SIZE = 32
+
+# Número máximo de repintados de los diálogos de progreso por operación
+PROGRESS_UPDATES = 50
+
+# Calidad JPEG con la que se guardan en memoria y en disco las fotos del registro
+JPEG_QUALITY = 85
+
+# Lista completa de facultades
+FACULTADES = (
+    "Ciencias Administrativas", 
+    "Ingeniería", 
+    "Ciencias Agropecuarias", 
+    "Ciencias del Deporte", 
+    "Educación", 
+    "Ciencias Sociales", 
+    "Ciencias de la Salud",
+    "Artes",
+    "Ciencias Exactas y Naturales",
+    "Ciencias Humanas",
+    "Ciencias Económicas",
+    "Derecho y Ciencias Políticas"
+)
+
+# Prefijos para cada facultad (para IDs únicos)
+PREFIJOS_FACULTAD = MappingProxyType({
+    "Ciencias Administrativas": "ADM", 
+    "Ingeniería": "ING", 
+    "Ciencias Agropecuarias": "AGR", 
+    "Ciencias del Deporte": "DEP", 
+    "Educación": "EDU", 
+    "Ciencias Sociales": "SOC", 
+    "Ciencias de la Salud": "SAL",
+    "Artes": "ART",
+    "Ciencias Exactas y Naturales": "CEN",
+    "Ciencias Humanas": "HUM",
+    "Ciencias Económicas": "ECO",
+    "Derecho y Ciencias Políticas": "DER"
+})
+
+# Programas académicos por facultad
+PROGRAMAS_POR_FACULTAD = MappingProxyType({
+    "Ciencias Administrativas": (
+        "Administración de Empresas", 
+        "Contaduría Pública", 
+        "Administración Turística y Hotelera",
+        "Administración Financiera",
+        "Administración Logística"
+    ),
+    "Ingeniería": (
+        "Ingeniería de Sistemas", 
+        "Ingeniería Electrónica", 
+        "Ingeniería Industrial",
+        "Ingeniería Ambiental",
+        "Tecnología en Desarrollo de Software"
+    ),
+    "Ciencias Agropecuarias": (
+        "Ingeniería Agronómica", 
+        "Zootecnia", 
+        "Medicina Veterinaria"
+    ),
+    "Ciencias del Deporte": (
+        "Licenciatura en Educación Física", 
+        "Ciencias del Deporte y la Educación Física",
+        "Profesional en Ciencias del Deporte"
+    ),
+    "Educación": (
+        "Licenciatura en Matemáticas", 
+        "Licenciatura en Ciencias Sociales",
+        "Licenciatura en Educación Básica", 
+        "Licenciatura en Lengua Castellana",
+        "Licenciatura en Inglés"
+    ),
+    "Ciencias Sociales": (
+        "Psicología", 
+        "Trabajo Social", 
+        "Sociología"
+    ),
+    "Ciencias de la Salud": (
+        "Enfermería", 
+        "Medicina"
+    ),
+    "Artes": (
+        "Música", 
+        "Artes Plásticas"
+    ),
+    "Ciencias Exactas y Naturales": (
+        "Matemáticas Aplicadas", 
+        "Física",
+        "Biología"
+    ),
+    "Ciencias Humanas": (
+        "Filosofía", 
+        "Historia"
+    ),
+    "Ciencias Económicas": (
+        "Economía", 
+        "Comercio Internacional"
+    ),
+    "Derecho y Ciencias Políticas": (
+        "Derecho", 
+        "Ciencias Políticas"
+    )
+})
+
+# Palabras que no aportan letra a la abreviación de un programa
+PALABRAS_VACIAS = frozenset({'de', 'en', 'la', 'el', 'los', 'las', 'y'})
+
+
+def _abreviar_programa(programa):
+    """
+    Genera la abreviación de un programa: primeras letras de cada palabra.
+    
+    La misma regla da el prefijo de las facultades creadas por el usuario.
+    
+    Args:
+        programa (str): Nombre del programa (o de la facultad)
+        
+    Returns:
+        str: Abreviación usada en los IDs únicos
+    """
+    return "".join(palabra[0] for palabra in programa.split()
+                   if palabra.lower() not in PALABRAS_VACIAS)
+
+
+# Abreviaciones de los programas conocidos, calculadas una sola vez al importar
+ABREVIACIONES_PROGRAMA = MappingProxyType({
+    programa: _abreviar_programa(programa)
+    for programas in PROGRAMAS_POR_FACULTAD.values()
+    for programa in programas
+})
+
+
+def _open_preview_camera():
+    """
+    Abre la cámara por defecto a la resolución de la vista previa.
+    
+    Returns:
+        cv2.VideoCapture: Cámara abierta, o None si no se pudo abrir
+    """
+    camera = None
+    try:
+        # Usamos el índice de cámara por defecto (0) a la resolución de la vista previa
+        camera = open_fastest_webcam(0, resolution=(PREVIEW_WIDTH, PREVIEW_HEIGHT))
+    except Exception as e:
+        print(f"Error al inicializar la cámara: {str(e)}")
+        
+    if camera is not None and camera.isOpened():
+        # Mantener solo el frame más reciente en el buffer del driver
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return camera
+
+
+def _encode_jpeg(img):
+    """
+    Comprime una imagen BGR a JPEG para conservarla en memoria.
+    
+    Args:
+        img (numpy.ndarray): Imagen BGR
+        
+    Returns:
+        bytes: Contenido del archivo JPEG
+    """
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(img), quality=JPEG_QUALITY, colorspace='BGR')
+        
+    # Sin optimización de Huffman ni modo progresivo: ruta SIMD más rápida de libjpeg-turbo
+    ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY,
+                                         cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+                                         cv2.IMWRITE_JPEG_PROGRESSIVE, 0])
+    if not ok:
+        raise ValueError("No se pudo codificar la imagen")
+    return buf.tobytes()
+
+
+def _write_jpeg(path, data):
+    """
+    Escribe en disco una foto ya codificada.
+    
+    Args:
+        path (str): Ruta de destino
+        data (bytes): Contenido JPEG
+        
+    Returns:
+        bool: True si se escribió correctamente
+    """
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def _thumbnail_size(h, w, size=100):
+    """
+    Calcula el tamaño de la miniatura de una imagen conservando la proporción.
+    
+    Args:
+        h (int): Alto de la imagen
+        w (int): Ancho de la imagen
+        size (int): Tamaño máximo del lado mayor de la miniatura
+        
+    Returns:
+        tuple: (ancho, alto) de la miniatura
+    """
+    if max(h, w) <= size:
+        return w, h
+    scale = size / max(h, w)
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+
+def _make_thumbnail(image, size=100, dst=None):
+    """
+    Reduce una imagen BGR al tamaño de miniatura conservando la proporción.
+    
+    Args:
+        image (numpy.ndarray): Imagen BGR
+        size (int): Tamaño máximo del lado mayor de la miniatura
+        dst (numpy.ndarray): Buffer opcional donde escribir la miniatura
+        
+    Returns:
+        numpy.ndarray: Miniatura BGR (la misma imagen si ya es pequeña)
+    """
+    h, w = image.shape[:2]
+    if max(h, w) <= size:
+        return image
+    return cv2.resize(image, _thumbnail_size(h, w, size), dst=dst,
+                      interpolation=cv2.INTER_AREA)
+
+
+def _load_dataset_image(img_path, max_side=800, with_thumbnail=True):
+    """
+    Decodifica una imagen del dataset, la comprime y genera su miniatura.
+    
+    Se ejecuta en hilos de trabajo: OpenCV libera el GIL al decodificar y
+    redimensionar, así que el hilo principal solo crea el QPixmap.
+    
+    Args:
+        img_path (str): Ruta de la imagen
+        max_side (int): Tamaño máximo del lado mayor
+        with_thumbnail (bool): False si la miniatura ya está en caché
+        
+    Returns:
+        tuple: (miniatura BGR o None, bytes JPEG) o None si no se pudo leer
+    """
+    # imdecode sobre np.fromfile también admite rutas con caracteres no ASCII
+    data = np.fromfile(img_path, dtype=np.uint8)
+    # En archivos grandes, libjpeg reduce a la mitad durante la decodificación
+    flags = cv2.IMREAD_REDUCED_COLOR_2 if data.size > LARGE_IMAGE_BYTES else cv2.IMREAD_COLOR
+    img = cv2.imdecode(data, flags)
+    if img is None:
+        return None
+        
+    h, w = img.shape[:2]
+    if h > max_side or w > max_side:
+        ratio = min(max_side / h, max_side / w)
+        img = cv2.resize(img, (int(w * ratio), int(h * ratio)))
+    thumb = _make_thumbnail(img) if with_thumbnail else None
+    return thumb, _encode_jpeg(img)
+
+
+def _thumbnail_cache_key(img_path):
+    """
+    Clave de QPixmapCache para la miniatura de un archivo del dataset.
+    
+    Incluye la fecha de modificación y el tamaño para no reutilizar
+    miniaturas de archivos que cambiaron.
+    
+    Args:
+        img_path (str): Ruta de la imagen
+        
+    Returns:
+        str: Clave de la caché
+    """
+    st = os.stat(img_path)
+    return f"dataset_thumb:{os.path.abspath(img_path)}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def _thumbnail_pixmap(image, size=100, dst=None):
+    """
+    Crea el QPixmap de la miniatura de una imagen BGR.
+    
+    Args:
+        image (numpy.ndarray): Imagen BGR
+        size (int): Tamaño máximo del lado mayor de la miniatura
+        dst (numpy.ndarray): Buffer opcional reutilizable para la miniatura
+        
+    Returns:
+        QPixmap: Miniatura
+    """
+    # Reducir primero con OpenCV para que Qt solo convierta la miniatura.
+    # QImage no copia los píxeles: thumb debe ser contiguo y seguir vivo
+    # hasta que QPixmap.fromImage haga su copia
+    thumb = np.ascontiguousarray(_make_thumbnail(image, size, dst))
+    th, tw, ch = thumb.shape
+    qt_image = QImage(thumb.data, tw, th, ch * tw, QImage.Format.Format_BGR888)
+    return QPixmap.fromImage(qt_image)  # QPixmap copia los píxeles
+
+
+def _read_json(path):
+    """
+    Lee un archivo JSON en UTF-8, con orjson si está instalado.
+    
+    Args:
+        path (str): Ruta del archivo
+        
+    Returns:
+        object: Contenido decodificado
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _load_people_index(index_path):
+    """
+    Lee el índice de metadata de las personas registradas.
+    
+    Args:
+        index_path (str): Ruta del índice
+        
+    Returns:
+        dict: {"facultad/persona": {"mtime", "data", "imagen"}}; vacío si no hay índice
+    """
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        return _read_json(index_path)
+    except Exception as e:
+        print(f"No se pudo leer el índice de personas: {str(e)}")
+        return {}
+
+
+def _save_people_index(index_path, entries):
+    """
+    Guarda el índice de metadata de las personas registradas de forma atómica.
+    
+    Args:
+        index_path (str): Ruta del índice
+        entries (dict): {"facultad/persona": {"mtime", "data", "imagen"}}
+    """
+    if orjson is not None:
+        raw = orjson.dumps(entries)
+    else:
+        raw = json.dumps(entries, ensure_ascii=False).encode('utf-8')
+    tmp_path = index_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"No se pudo guardar el índice de personas: {str(e)}")
+
+
+def _load_embedding_cache(cache_path, variant=None):
+    """
+    Lee la caché de embeddings faciales guardada en disco.
+    
+    Args:
+        cache_path (str): Ruta del archivo .npz
+        variant (str): Variante de FaceNet esperada; None acepta cualquiera
+        
+    Returns:
+        dict: {ruta relativa de la imagen: (mtime_ns, embedding)}; vacío si no hay
+        caché o si la generó otra variante del modelo
+    """
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with np.load(cache_path) as data:
+            stored = str(data['variant']) if 'variant' in data.files else None
+            if variant is not None and stored != variant:
+                return {}
+            return {
+                str(path): (int(mtime), embedding)
+                for path, mtime, embedding in zip(data['paths'], data['mtimes'], data['embeddings'])
+            }
+    except Exception as e:
+        print(f"No se pudo leer la caché de embeddings: {str(e)}")
+        return {}
+
+
+def _save_embedding_cache(cache_path, entries, variant):
+    """
+    Guarda la caché de embeddings faciales de forma atómica.
+    
+    Args:
+        cache_path (str): Ruta del archivo .npz
+        entries (dict): {ruta relativa de la imagen: (mtime_ns, embedding)}
+        variant (str): Variante de FaceNet que generó los embeddings
+    """
+    paths = list(entries)
+    if paths:
+        embeddings = np.stack([entries[p][1] for p in paths]).astype(np.float32)
+    else:
+        embeddings = np.empty((0, 512), dtype=np.float32)
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, paths=np.array(paths, dtype=str),
+                     mtimes=np.array([entries[p][0] for p in paths], dtype=np.int64),
+                     embeddings=embeddings, variant=np.array(variant))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"No se pudo guardar la caché de embeddings: {str(e)}")
+
+
+def _decode_rgb(img_path):
+    """
+    Lee una imagen del disco y la convierte a RGB.
+    
+    Args:
+        img_path (str): Ruta de la imagen
+        
+    Returns:
+        numpy.ndarray: Imagen RGB, o None si no se pudo leer
+    """
+    img = cv2.imread(img_path)
+    if img is None:
+        return None
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def _face_entry(person_data, embedding):
+    """
+    Construye los datos de comparación de una persona registrada.
+    
+    Args:
+        person_data (dict): Metadata leída de info.json
+        embedding (numpy.ndarray): Embedding facial de la persona
+        
+    Returns:
+        dict: Embedding con nombre, facultad y programa
+    """
+    return {
+        'embedding': embedding,
+        'nombre': person_data.get("nombre", ""),
+        'facultad': person_data.get("facultad", ""),
+        'programa': person_data.get("programa", "")
+    }
+
+
+def _first_face_tensor(faces):
+    """
+    Normaliza la salida de MTCNN a un tensor (1, 3, 160, 160) con el primer rostro.
+    
+    Args:
+        faces: Salida de MTCNN (tensor, lista de tensores o None)
+        
+    Returns:
+        torch.Tensor: Tensor del rostro más probable o None si no hay rostro
+    """
+    if faces is None:
+        return None
+    if isinstance(faces, list):
+        if not faces:
+            return None
+        faces = faces[0]
+    if faces is None:
+        return None
+        
+    # Normalizar dimensiones
+    if faces.ndim == 5:
+        faces = faces[0]
+    if faces.ndim == 3:
+        faces = faces.unsqueeze(0)
+    # Con keep_all=True puede haber varios rostros; están ordenados por probabilidad
+    return faces[:1]
+
+
+def _dhash(img):
+    """
+    Calcula un hash perceptual (dHash de 64 bits) de una imagen BGR.
+    
+    Args:
+        img (numpy.ndarray): Imagen BGR
+        
+    Returns:
+        int: Hash de la imagen
+    """
+    gray = cv2.cvtColor(cv2.resize(img, (9, 8), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+    return int.from_bytes(np.packbits(gray[:, 1:] > gray[:, :-1]).tobytes(), 'big')
+
+class ThumbnailModel(QAbstractListModel):
+    """Modelo de lista con las miniaturas de las fotos capturadas."""
+    
+    def __init__(self, parent=None):
+        """
+        Inicializa el modelo vacío.
+        
+        Args:
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self._pixmaps = []
+        
+    def rowCount(self, parent=QModelIndex()):
+        """Número de miniaturas."""
+        return 0 if parent.isValid() else len(self._pixmaps)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Devuelve la miniatura como decoración del elemento."""
+        if index.isValid() and role == Qt.ItemDataRole.DecorationRole:
+            return self._pixmaps[index.row()]
+        return None
+        
+    def append_pixmaps(self, pixmaps):
+        """
+        Añade varias miniaturas con una sola notificación a la vista.
+        
+        Args:
+            pixmaps (list): Lista de QPixmap
+        """
+        if not pixmaps:
+            return
+        first = len(self._pixmaps)
+        self.beginInsertRows(QModelIndex(), first, first + len(pixmaps) - 1)
+        self._pixmaps.extend(pixmaps)
+        self.endInsertRows()
+        
+    def clear(self):
+        """Elimina todas las miniaturas."""
+        self.beginResetModel()
+        self._pixmaps.clear()
+        self.endResetModel()
+
+
+class CaptureFaceWorker(QThread):
+    """Hilo que detecta el rostro de una foto capturada y extrae su embedding."""
+    
+    face_analyzed = pyqtSignal(object, object, object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, frame, frame_hash, mtcnn, facenet, parent=None):
+        """
+        Inicializa el análisis de una foto.
+        
+        Args:
+            frame (numpy.ndarray): Frame BGR capturado
+            frame_hash (int): dHash del frame
+            mtcnn: Modelo MTCNN
+            facenet: Modelo FaceNet
+            parent: Objeto padre para la jerarquía de Qt
+        """
+        super().__init__(parent)
+        self.frame = frame
+        self.frame_hash = frame_hash
+        self.mtcnn = mtcnn
+        self.facenet = facenet
+        
+    def run(self):
+        """Emite (frame, hash, embedding), con embedding None si no hay rostro."""
+        try:
+            # Detectar rostro sobre una copia reducida, pero recortarlo del frame completo:
+            # los embeddings registrados salen de fotos a resolución completa
+            frame = self.frame
+            scale = min(1.0, MTCNN_MAX_SIDE / max(frame.shape[:2]))
+            if scale < 1.0:
+                small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            boxes, probs = self.mtcnn.detect(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+            
+            face_embedding = None
+            face_tensor = None
+            if boxes is not None and len(boxes):
+                # Quedarse con el rostro más probable, en coordenadas del frame completo
+                best = int(np.argmax(probs))
+                box = boxes[best:best + 1] / scale
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                face_tensor = _first_face_tensor(self.mtcnn.extract(rgb_frame, box, None))
+            if face_tensor is not None:
+                # Extraer embedding para comparar con la base de datos
+                with torch.inference_mode():
+                    face_embedding = self.facenet(face_tensor).cpu().numpy().flatten()
+            self.face_analyzed.emit(frame, self.frame_hash, face_embedding)
+        except Exception as e:
+            print(f"Error al capturar foto: {str(e)}")
+            traceback.print_exc()
+            self.failed.emit(str(e))
+        finally:
+            self.frame = None  # La señal ya lleva el frame; no retenerlo en el hilo
+
+
+class FaceLoaderWorker(QThread):
+    """Hilo que obtiene los embeddings de las personas registradas sin bloquear la interfaz."""
+    
+    faces_loaded = pyqtSignal(object)
+    
+    def __init__(self, registros, mtcnn, facenet, device=None, parent=None):
+        """
+        Inicializa el hilo de carga de rostros.
+        
+        Args:
+            registros (list): Tuplas (ID, metadata, ruta de la imagen) de cada persona
+            mtcnn: Modelo MTCNN, o None si no está cargado
+            facenet: Modelo FaceNet, o None si no está cargado
+            device: Dispositivo de FaceNet ('cpu', 'cuda'); None usa el de los tensores
+            parent: Objeto padre para la jerarquía de Qt
+        """
+        super().__init__(parent)
+        self.registros = registros
+        self.mtcnn = mtcnn
+        self.facenet = facenet
+        self.device = device
+        
+    def run(self):
+        """Calcula los embeddings y emite {ID: datos del rostro} al terminar."""
+        try:
+            faces = self._load_faces()
+            if faces is not None:
+                self.faces_loaded.emit(faces)
+        except Exception as e:
+            print(f"Error al cargar rostros existentes: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self.registros = None
+            
+    def _load_faces(self):
+        """
+        Obtiene los embeddings de la caché en disco o, si faltan, de los modelos.
+        
+        Returns:
+            dict: {ID: datos del rostro}, o None si se interrumpió la carga
+        """
+        faces = {}
+        
+        # Sin modelos se usa la caché tal cual; con modelos, solo si la generó la misma variante
+        variant = None
+        if self.facenet is not None:
+            variant = (facenet_variant(self.facenet) if facenet_variant is not None else None) or "desconocida"
+        
+        # 1. Reutilizar los embeddings de imágenes que no cambiaron desde la última vez
+        cache = _load_embedding_cache(EMBEDDINGS_CACHE_PATH, variant)
+        vigentes = {}  # Entradas de la caché que siguen siendo válidas
+        pendientes = []
+        for person_id, person_data, img_path in self.registros:
+            clave = os.path.relpath(img_path, BASE_PATH)
+            try:
+                mtime = os.stat(img_path).st_mtime_ns
+            except OSError:
+                continue
+            cached = cache.get(clave)
+            if cached is not None and cached[0] == mtime:
+                vigentes[clave] = cached
+                faces[person_id] = _face_entry(person_data, cached[1])
+            else:
+                pendientes.append((person_id, person_data, img_path, clave, mtime))
+        
+        # Extraer con los modelos, si están cargados, los embeddings que faltan
+        if pendientes and self.mtcnn is not None and self.facenet is not None:
+            facenet = self.facenet
+            mtcnn = self.mtcnn
+            
+            # Las imágenes se decodifican en paralelo, un lote por delante de los modelos
+            for lote in self._decoded_batches(pendientes):
+                if self.isInterruptionRequested():
+                    return None
+                    
+                # 2. Detectar el rostro de cada imagen con MTCNN
+                rostros = []
+                for (person_id, person_data, img_path, clave, mtime), rgb_img in lote:
+                    # Cada pase de MTCNN es lento: done() espera a este hilo al cerrar
+                    if self.isInterruptionRequested():
+                        return None
+                    if rgb_img is None:
+                        continue
+                    face_tensor = _first_face_tensor(mtcnn(rgb_img))
+                    if face_tensor is not None:
+                        rostros.append((person_id, person_data, clave, mtime, face_tensor))
+                if not rostros:
+                    continue
+                
+                # 3. Extraer los embeddings del lote en un solo pase de FaceNet;
+                # en CUDA se ejecuta en FP16 sin convertir el modelo compartido con la ventana principal.
+                # MTCNN entrega tensores en CPU: el lote se lleva al dispositivo del modelo
+                batch = torch.cat([face_tensor for *_, face_tensor in rostros])
+                if self.device is not None:
+                    batch = batch.to(self.device, non_blocking=True)
+                device_type = batch.device.type
+                with torch.inference_mode(), torch.autocast(
+                        device_type, dtype=torch.float16, enabled=device_type == 'cuda'):
+                    embeddings = facenet(batch).float().cpu().numpy()
+                    
+                for (person_id, person_data, clave, mtime, _), embedding_np in zip(rostros, embeddings):
+                    vigentes[clave] = (mtime, embedding_np)
+                    faces[person_id] = _face_entry(person_data, embedding_np)
+        
+        # Reescribir la caché solo si se añadieron o descartaron entradas, y solo
+        # si se sabe con qué modelo se calcularon
+        if variant is not None and (
+                len(vigentes) != len(cache) or any(cache.get(k) is not v for k, v in vigentes.items())):
+            _save_embedding_cache(EMBEDDINGS_CACHE_PATH, vigentes, variant)
+        return faces
+        
+    def _decoded_batches(self, pendientes):
+        """
+        Decodifica las imágenes pendientes en un pool de hilos, por lotes.
+        
+        Mientras se procesa un lote, el pool ya decodifica el siguiente
+        (OpenCV libera el GIL), así la lectura de disco no detiene a los modelos.
+        
+        Args:
+            pendientes (list): Tuplas (ID, metadata, ruta, clave de caché, mtime)
+            
+        Yields:
+            list: Pares (tupla pendiente, imagen RGB o None) de un lote
+        """
+        lotes = [pendientes[i:i + EMBEDDING_BATCH_SIZE]
+                 for i in range(0, len(pendientes), EMBEDDING_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            siguientes = [pool.submit(_decode_rgb, entry[2]) for entry in lotes[0]] if lotes else []
+            for n, lote in enumerate(lotes):
+                actuales = siguientes
+                if n + 1 < len(lotes):
+                    siguientes = [pool.submit(_decode_rgb, entry[2]) for entry in lotes[n + 1]]
+                yield [(entry, futuro.result()) for entry, futuro in zip(lote, actuales)]
+
+
 class RegistroPersonaDialog(QDialog):
     """Diálogo para el registro de personas."""
     
+    _logo_pixmap = None  # Logo ya escalado, compartido entre instancias
+    
+    # Campos de selección que se copian tal cual a info.json: (clave, combo)
+    _CAMPOS_SELECCION = (
+        ("rol", "rol_input"),
+        ("tipo", "tipo_acceso"),
+        ("sede", "sede_input"),
+        ("extension", "extension_input"),
+    )
+    
     def __init__(self, parent=None):
         """
         Inicializa el diálogo de registro.
@@ -48,209 +829,144 @@ class RegistroPersonaDialog(QDialog):
         # Políticas de tamaño para hacer la ventana responsive
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
-        self.captured_images = []
+        self.captured_images = []  # Fotos comprimidas en JPEG (bytes)
+        self._capture_hashes = []  # dHash de cada foto capturada
+        self._io_pool = None  # Pool de hilos de E/S, se crea al primer uso
+        self._validated_fields = {}  # Textos del formulario leídos en validate_inputs
+        self._preview_np = None  # Buffer persistente de la vista previa
+        self._preview_qimg = None  # QImage que envuelve _preview_np
+        self._preview_src_shape = None  # Forma de los frames para la que se reservó _preview_np
+        self._last_frame_sig = None  # Firma del último frame mostrado
+        self._thumb_buf = None  # Buffer reutilizado para las miniaturas de las capturas
+        self._last_facultad = None  # Facultad cuyos programas muestra programa_input
         self.person_data = None
         self.existing_faces = {}  # Para comprobar rostros existentes
+        self.existing_ids = {}  # ID ya registrado -> nombre, tenga o no rostro detectado
+        self._face_loader = None  # Hilo que calcula los embeddings de existing_faces
+        self._capture_worker = None  # Hilo que analiza la última foto capturada
+        self._emb_ids = []  # IDs en el orden de las filas de _emb_matrix
+        self._emb_matrix = np.empty((0, 512), dtype=np.float32)  # Embeddings normalizados (N, 512)
+        self._faiss_index = None  # Índice de producto interno sobre _emb_matrix, si hay faiss
         self.load_existing_faces()  # Cargar rostros existentes para comparación
         
-        # Lista completa de facultades
-        self.todas_facultades = [
-            "Ciencias Administrativas", 
-            "Ingeniería", 
-            "Ciencias Agropecuarias", 
-            "Ciencias del Deporte", 
-            "Educación", 
-            "Ciencias Sociales", 
-            "Ciencias de la Salud",
-            "Artes",
-            "Ciencias Exactas y Naturales",
-            "Ciencias Humanas",
-            "Ciencias Económicas",
-            "Derecho y Ciencias Políticas"
-        ]
-        
-        # Prefijos para cada facultad (para IDs únicos)
-        self.prefijos_facultad = {
-            "Ciencias Administrativas": "ADM", 
-            "Ingeniería": "ING", 
-            "Ciencias Agropecuarias": "AGR", 
-            "Ciencias del Deporte": "DEP", 
-            "Educación": "EDU", 
-            "Ciencias Sociales": "SOC", 
-            "Ciencias de la Salud": "SAL",
-            "Artes": "ART",
-            "Ciencias Exactas y Naturales": "CEN",
-            "Ciencias Humanas": "HUM",
-            "Ciencias Económicas": "ECO",
-            "Derecho y Ciencias Políticas": "DER"
-        }
-        
-        # Programas académicos por facultad
+        # Copias por instancia: el usuario puede añadir facultades y programas
+        self.todas_facultades = list(FACULTADES)
+        self.prefijos_facultad = dict(PREFIJOS_FACULTAD)
         self.programas_por_facultad = {
-            "Ciencias Administrativas": [
-                "Administración de Empresas", 
-                "Contaduría Pública", 
-                "Administración Turística y Hotelera",
-                "Administración Financiera",
-                "Administración Logística"
-            ],
-            "Ingeniería": [
-                "Ingeniería de Sistemas", 
-                "Ingeniería Electrónica", 
-                "Ingeniería Industrial",
-                "Ingeniería Ambiental",
-                "Tecnología en Desarrollo de Software"
-            ],
-            "Ciencias Agropecuarias": [
-                "Ingeniería Agronómica", 
-                "Zootecnia", 
-                "Medicina Veterinaria"
-            ],
-            "Ciencias del Deporte": [
-                "Licenciatura en Educación Física", 
-                "Ciencias del Deporte y la Educación Física",
-                "Profesional en Ciencias del Deporte"
-            ],
-            "Educación": [
-                "Licenciatura en Matemáticas", 
-                "Licenciatura en Ciencias Sociales",
-                "Licenciatura en Educación Básica", 
-                "Licenciatura en Lengua Castellana",
-                "Licenciatura en Inglés"
-            ],
-            "Ciencias Sociales": [
-                "Psicología", 
-                "Trabajo Social", 
-                "Sociología"
-            ],
-            "Ciencias de la Salud": [
-                "Enfermería", 
-                "Medicina"
-            ],
-            "Artes": [
-                "Música", 
-                "Artes Plásticas"
-            ],
-            "Ciencias Exactas y Naturales": [
-                "Matemáticas Aplicadas", 
-                "Física",
-                "Biología"
-            ],
-            "Ciencias Humanas": [
-                "Filosofía", 
-                "Historia"
-            ],
-            "Ciencias Económicas": [
-                "Economía", 
-                "Comercio Internacional"
-            ],
-            "Derecho y Ciencias Políticas": [
-                "Derecho", 
-                "Ciencias Políticas"
-            ]
+            facultad: list(programas) for facultad, programas in PROGRAMAS_POR_FACULTAD.items()
         }
         
         # Abreviaciones para programas (para IDs únicos)
-        self.abreviaciones_programa = {}
-        for facultad, programas in self.programas_por_facultad.items():
-            for programa in programas:
-                # Generar abreviación: primeras letras de cada palabra
-                palabras = programa.split()
-                abreviacion = ""
-                for palabra in palabras:
-                    if palabra.lower() not in ['de', 'en', 'la', 'el', 'los', 'las', 'y']:
-                        abreviacion += palabra[0]
-                self.abreviaciones_programa[programa] = abreviacion
+        self.abreviaciones_programa = dict(ABREVIACIONES_PROGRAMA)
         
         self.setup_ui()
 
     def load_existing_faces(self):
-        """Carga embeddings faciales existentes para comparación."""
+        """
+        Carga los IDs registrados y lanza en segundo plano la carga de sus embeddings.
+        
+        Los IDs se leen aquí para que generate_unique_id no dependa del hilo;
+        existing_faces se completa cuando FaceLoaderWorker emite faces_loaded.
+        """
         try:
             if not os.path.exists(BASE_PATH):
                 return
                 
-            # Si el padre tiene el modelo facenet, lo usamos para extraer embeddings
-            parent_widget = self.parent()
-            if parent_widget is None or not hasattr(parent_widget, 'facenet'):
-                return
-                
-            facenet = parent_widget.facenet
-            mtcnn = parent_widget.mtcnn
-            
-            # Recorremos todas las personas registradas
-            for facultad in os.listdir(BASE_PATH):
-                facultad_path = os.path.join(BASE_PATH, facultad)
-                if not os.path.isdir(facultad_path):
-                    continue
+            # 1. Recorrer todas las personas registradas y reunir (ID, metadata, imagen);
+            # la metadata sale del índice mientras info.json no haya cambiado
+            index = _load_people_index(PEOPLE_INDEX_PATH)
+            vigentes = {}  # Entradas del índice válidas en este recorrido
+            registros = []
+            # scandir reutiliza el tipo de cada entrada del directorio: sin un stat por isdir
+            with os.scandir(BASE_PATH) as it:
+                facultades = [e for e in it if e.is_dir(follow_symlinks=False)]
+            for facultad_entry in facultades:
+                # Los directorios ocultos son registros a medio publicar (.registro_*)
+                with os.scandir(facultad_entry.path) as it:
+                    personas = [e for e in it
+                                if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')]
                 
-                for persona in os.listdir(facultad_path):
-                    persona_path = os.path.join(facultad_path, persona)
-                    if not os.path.isdir(persona_path):
-                        continue
+                for persona_entry in personas:
+                    persona_path = persona_entry.path
                     
-                    # Cargar metadata para obtener ID
+                    # Cargar metadata para obtener ID; el stat también confirma que existe
                     info_path = os.path.join(persona_path, "info.json")
-                    if not os.path.exists(info_path):
-                        continue
-                        
                     try:
-                        with open(info_path, 'r', encoding='utf-8') as f:
-                            person_data = json.load(f)
-                            person_id = person_data.get("id", "")
-                    except Exception:
+                        mtime = os.stat(info_path).st_mtime_ns
+                    except OSError:
                         continue
                     
-                    # Cargar una imagen para extraer el embedding
-                    image_files = [f for f in os.listdir(persona_path) 
-                                   if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-                    if not image_files:
+                    clave = f"{facultad_entry.name}/{persona_entry.name}"
+                    entrada = index.get(clave)
+                    if entrada is None or entrada.get("mtime") != mtime:
+                        try:
+                            person_data = _read_json(info_path)
+                        except Exception:
+                            continue
+                            
+                        # Guardar también la primera imagen, que se usa para extraer el embedding
+                        with os.scandir(persona_path) as it:
+                            image_files = [e.name for e in it
+                                           if os.path.splitext(e.name)[1].lower() in VALID_EXTENSIONS]
+                        entrada = {
+                            "mtime": mtime,
+                            "data": person_data,
+                            "imagen": image_files[0] if image_files else None
+                        }
+                    vigentes[clave] = entrada
+                    
+                    person_data = entrada["data"]
+                    person_id = person_data.get("id", "")
+                    self.existing_ids[person_id] = person_data.get("nombre", "")
+                    
+                    if entrada["imagen"] is None:
                         continue
                         
                     # Usar solo la primera imagen
-                    img_path = os.path.join(persona_path, image_files[0])
-                    img = cv2.imread(img_path)
-                    if img is None:
-                        continue
-                        
-                    # Convertir a RGB y detectar rostro
-                    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    faces = mtcnn(rgb_img)
-                    
-                    if faces is not None:
-                        # Procesar el tensor de rostros
-                        if isinstance(faces, list) and faces:
-                            face_tensor = faces[0]
-                        else:
-                            face_tensor = faces
-
-                        if face_tensor is not None:
-                            # Normalizar dimensiones
-                            if face_tensor.ndim == 5:
-                                face_tensor = face_tensor.squeeze(0)
-                            if face_tensor.ndim == 4:
-                                face_tensor = face_tensor.squeeze(0)
-                            if face_tensor.ndim == 3:
-                                face_tensor = face_tensor.unsqueeze(0)
-                                
-                            # Obtener embedding
-                            with torch.no_grad():
-                                embedding = facenet(face_tensor)
-                                embedding_np = embedding.cpu().numpy().flatten()
-                                
-                                # Guardar embedding con el ID
-                                self.existing_faces[person_id] = {
-                                    'embedding': embedding_np,
-                                    'nombre': person_data.get("nombre", ""),
-                                    'facultad': person_data.get("facultad", ""),
-                                    'programa': person_data.get("programa", "")
-                                }
+                    registros.append((person_id, person_data, os.path.join(persona_path, entrada["imagen"])))
+            
+            # Reescribir el índice solo si cambió alguna entrada
+            if vigentes != index:
+                _save_people_index(PEOPLE_INDEX_PATH, vigentes)
+            
+            # 2. Extraer los embeddings en segundo plano; el diálogo se muestra sin esperar
+            parent_widget = self.parent()
+            mtcnn = getattr(parent_widget, 'mtcnn', None)
+            facenet = getattr(parent_widget, 'facenet', None)
+            device = getattr(parent_widget, 'device', None)
+            self._face_loader = FaceLoaderWorker(registros, mtcnn, facenet, device, self)
+            self._face_loader.faces_loaded.connect(self.on_faces_loaded)
+            self._face_loader.finished.connect(self._on_worker_finished)
+            self._face_loader.start()
         except Exception as e:
             print(f"Error al cargar rostros existentes: {str(e)}")
             traceback.print_exc()
 
+    def on_faces_loaded(self, faces):
+        """
+        Recibe los embeddings calculados por FaceLoaderWorker.
+        
+        Args:
+            faces (dict): {ID: datos del rostro}
+        """
+        self.existing_faces.update(faces)
+        
+        # Matriz contigua de embeddings unitarios: comparar un rostro es un solo producto matricial
+        self._emb_ids = [pid for pid, data in self.existing_faces.items() if 'embedding' in data]
+        if self._emb_ids:
+            matrix = np.stack([self.existing_faces[pid]['embedding'] for pid in self._emb_ids]).astype(np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._emb_matrix = matrix
+            
+            if faiss is not None:
+                self._faiss_index = faiss.IndexFlatIP(matrix.shape[1])
+                self._faiss_index.add(matrix)
+
     def setup_ui(self):
         """Configura la interfaz de usuario."""
+        # Una sola hoja de estilo para todas las etiquetas del formulario
+        self.setStyleSheet('QLabel[role="formLabel"] { font-size: 14px; font-weight: bold; }')
+        
         main_layout = QHBoxLayout()
         
         # Panel izquierdo (formulario)
@@ -263,11 +979,15 @@ class RegistroPersonaDialog(QDialog):
         logo_label = QLabel()
         logo_udec_path = "resources/images/Logo_YoloGuard.jpg"  # Ruta al logo
         
-        if os.path.exists(logo_udec_path):
+        if RegistroPersonaDialog._logo_pixmap is not None:
+            # Reutilizar el logo decodificado en una apertura anterior
+            logo_pixmap = RegistroPersonaDialog._logo_pixmap
+        elif os.path.exists(logo_udec_path):
             # Si existe el archivo de imagen, lo cargamos
             logo_pixmap = QPixmap(logo_udec_path)
             # Escalamos el logo a un tamaño adecuado
             logo_pixmap = logo_pixmap.scaled(150, 60, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            RegistroPersonaDialog._logo_pixmap = logo_pixmap
         else:
             # Si no existe, creamos un logo placeholder
             logo_pixmap = QPixmap(150, 60)
@@ -277,6 +997,7 @@ class RegistroPersonaDialog(QDialog):
             painter.setFont(QFont("Arial", 20, QFont.Weight.Bold))
             painter.drawText(logo_pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "UDEC")
             painter.end()
+            RegistroPersonaDialog._logo_pixmap = logo_pixmap
             
         logo_label.setPixmap(logo_pixmap)
         logo_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
@@ -381,25 +1102,22 @@ class RegistroPersonaDialog(QDialog):
         self.semestre_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.semestre_input.addItems(["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "Egresado"])
         self.semestre_label = QLabel("Semestre:")
-        self.semestre_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        self.semestre_label.setProperty("role", "formLabel")
         self.semestre_layout.addWidget(self.semestre_label)
         self.semestre_layout.addWidget(self.semestre_input)
         self.semestre_widget = QWidget()
         self.semestre_widget.setLayout(self.semestre_layout)
         self.semestre_widget.setVisible(False)  # Inicialmente oculto
 
-        # Estilo de etiquetas de formulario
-        form_label_style = "font-size: 14px; font-weight: bold;"
-        
         # Crear etiquetas con estilo
         nombre_label = QLabel("Nombre completo:")
-        nombre_label.setStyleSheet(form_label_style)
+        nombre_label.setProperty("role", "formLabel")
         id_label = QLabel("ID/Código:")
-        id_label.setStyleSheet(form_label_style)
+        id_label.setProperty("role", "formLabel")
         rol_label = QLabel("Rol:")
-        rol_label.setStyleSheet(form_label_style)
+        rol_label.setProperty("role", "formLabel")
         tipo_label = QLabel("Tipo de Acceso:")
-        tipo_label.setStyleSheet(form_label_style)
+        tipo_label.setProperty("role", "formLabel")
         
         form_layout.addRow(nombre_label, self.nombre_input)
         form_layout.addRow(id_label, id_layout)
@@ -428,6 +1146,7 @@ class RegistroPersonaDialog(QDialog):
         self.extension_input = QComboBox()
         self.extension_input.setMinimumHeight(30)
         self.extension_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.extension_input.addItems(SEDES)  # Las extensiones son las mismas que las sedes
         
         # Facultad con creación dinámica
         facultad_layout = QHBoxLayout()
@@ -464,13 +1183,13 @@ class RegistroPersonaDialog(QDialog):
         
         # Etiquetas con estilo mejorado
         sede_label = QLabel("Sede:")
-        sede_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        sede_label.setProperty("role", "formLabel")
         extension_label = QLabel("Extensión:")
-        extension_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        extension_label.setProperty("role", "formLabel")
         facultad_label = QLabel("Facultad:")
-        facultad_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        facultad_label.setProperty("role", "formLabel")
         programa_label = QLabel("Programa:")
-        programa_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        programa_label.setProperty("role", "formLabel")
         
         academic_form.addRow(sede_label, self.sede_input)
         academic_form.addRow(extension_label, self.extension_input)
@@ -494,12 +1213,12 @@ class RegistroPersonaDialog(QDialog):
         info_group = QGroupBox("Información de Captura")
         info_layout = QVBoxLayout()
         self.info_label = QLabel("Capture al menos 5 fotos desde diferentes ángulos")
-        self.info_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        self.info_label.setProperty("role", "formLabel")
         self.info_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         self.info_label.setWordWrap(True)
         
         self.counter_label = QLabel("Fotos capturadas: 0/5")
-        self.counter_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        self.counter_label.setProperty("role", "formLabel")
         self.counter_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         
         info_layout.addWidget(self.info_label)
@@ -540,8 +1259,7 @@ class RegistroPersonaDialog(QDialog):
         preview_layout = QVBoxLayout()
         
         self.preview_label = QLabel()
-        self.preview_label.setMinimumSize(640, 480)
-        self.preview_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.preview_label.setFixedSize(PREVIEW_WIDTH, PREVIEW_HEIGHT)
         self.preview_label.setStyleSheet("""
             border: 2px solid #006633;
             background-color: #f0f0f0;
@@ -549,6 +1267,12 @@ class RegistroPersonaDialog(QDialog):
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         preview_layout.addWidget(self.preview_label)
         
+        # Capa de flash reutilizable para el efecto de captura
+        self.flash_label = QLabel(self.preview_label)
+        self.flash_label.setStyleSheet("background-color: rgba(255, 255, 255, 0.7);")
+        self.flash_label.resize(self.preview_label.size())
+        self.flash_label.hide()
+        
         self.capturar_btn = QPushButton("📸 Capturar Foto")
         self.capturar_btn.setMinimumHeight(40)
         self.capturar_btn.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
@@ -560,13 +1284,20 @@ class RegistroPersonaDialog(QDialog):
 
         # Miniaturas de fotos capturadas
         thumbnails_group = QGroupBox("Fotos Capturadas")
-        thumbnails_scroll = QScrollArea()
-        thumbnails_scroll.setWidgetResizable(True)
-        thumbnails_widget = QWidget()
-        self.thumbnails_layout = QHBoxLayout(thumbnails_widget)
-        thumbnails_scroll.setWidget(thumbnails_widget)
+        # Vista de lista en modo icono: no crea un widget por foto y solo pinta las visibles
+        self.thumbnails_model = ThumbnailModel(self)
+        self.thumbnails_view = QListView()
+        self.thumbnails_view.setModel(self.thumbnails_model)
+        self.thumbnails_view.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnails_view.setFlow(QListView.Flow.LeftToRight)
+        self.thumbnails_view.setWrapping(False)
+        self.thumbnails_view.setMovement(QListView.Movement.Static)
+        self.thumbnails_view.setUniformItemSizes(True)
+        self.thumbnails_view.setIconSize(QSize(100, 100))
+        self.thumbnails_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.thumbnails_view.setMinimumHeight(130)
         thumbnails_layout = QVBoxLayout()
-        thumbnails_layout.addWidget(thumbnails_scroll)
+        thumbnails_layout.addWidget(self.thumbnails_view)
         thumbnails_group.setLayout(thumbnails_layout)
         right_panel.addWidget(thumbnails_group)
 
@@ -583,29 +1314,19 @@ class RegistroPersonaDialog(QDialog):
         main_layout.addWidget(right_widget, 2)
         self.setLayout(main_layout)
 
-        # Inicializar cámara con método optimizado
-        self.camera = None
-        try:
-            # Intentamos importar la función para abrir la cámara
-            try:
-                from utils.camera import open_fastest_webcam
-                # Usamos el índice de cámara por defecto (0)
-                self.camera = open_fastest_webcam(0)
-            except ImportError:
-                # Si no podemos importar la función, usamos OpenCV directamente
-                self.camera = cv2.VideoCapture(0)
-        except Exception as e:
-            print(f"Error al inicializar la cámara: {str(e)}")
-                
-        if self.camera is None or not self.camera.isOpened():
-            QMessageBox.warning(self, "Advertencia", "No se pudo inicializar la cámara. Algunas funciones pueden no estar disponibles.")
-        
-        # Definir FPS objetivo en caso de que no se pueda importar
-        target_fps = TARGET_FPS if 'TARGET_FPS' in globals() else 30
-            
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_preview)
-        self.timer.start(1000 // target_fps)  # Ajustar para obtener el FPS deseado
+        # La cámara se abre en el hilo de captura: el diálogo se muestra sin esperar
+        # al driver, y las lecturas bloqueantes tampoco pasan por la interfaz
+        self.camera_worker = CameraWorker(None, self, opener=_open_preview_camera)
+        self.camera_worker.frame_ready.connect(self.update_preview)
+        self.camera_worker.camera_failed.connect(self.on_camera_failed)
+        self.camera_worker.start()
+
+    def on_camera_failed(self):
+        """Avisa de que no se pudo abrir la cámara."""
+        if self.camera_worker is None:
+            return  # El diálogo ya se cerró
+        self.camera_worker = None
+        QMessageBox.warning(self, "Advertencia", "No se pudo inicializar la cámara. Algunas funciones pueden no estar disponibles.")
 
     def on_rol_changed(self, index):
         """Muestra u oculta campos dependiendo del rol seleccionado."""
@@ -621,10 +1342,7 @@ class RegistroPersonaDialog(QDialog):
         """Actualiza las extensiones y programas según la sede seleccionada."""
         sede_actual = self.sede_input.currentText()
         
-        # Limpiar y actualizar extensiones (son las mismas que sedes para simplificar)
-        self.extension_input.clear()
-        self.extension_input.addItems(SEDES)
-        # Por defecto seleccionar la misma que la sede
+        # Las extensiones no cambian con la sede: por defecto seleccionar la misma que la sede
         extension_index = self.extension_input.findText(sede_actual)
         if extension_index >= 0:
             self.extension_input.setCurrentIndex(extension_index)
@@ -632,13 +1350,17 @@ class RegistroPersonaDialog(QDialog):
     def update_programas(self, index):
         """Actualiza los programas según la facultad seleccionada."""
         facultad_actual = self.facultad_input.currentText()
+        if facultad_actual == self._last_facultad:
+            return  # La lista ya corresponde a esta facultad
+        self._last_facultad = facultad_actual
         
-        # Limpiar el combo de programas
-        self.programa_input.clear()
-        
-        # Agregar programas según la facultad seleccionada
-        if facultad_actual in self.programas_por_facultad:
-            self.programa_input.addItems(self.programas_por_facultad[facultad_actual])
+        # Reconstruir el combo sin que cada paso de clear/addItems emita señales
+        with QSignalBlocker(self.programa_input):
+            self.programa_input.clear()
+            
+            # Agregar programas según la facultad seleccionada
+            if facultad_actual in self.programas_por_facultad:
+                self.programa_input.addItems(self.programas_por_facultad[facultad_actual])
             
         # Sugerir generar un ID nuevo cuando cambia la facultad
         self.suggest_generate_id()
@@ -670,15 +1392,11 @@ class RegistroPersonaDialog(QDialog):
             prefijo_facultad = self.prefijos_facultad.get(facultad, "UDC")
             
             # Crear el prefijo de programa
-            prefijo_programa = ""
             if programa in self.abreviaciones_programa:
                 prefijo_programa = self.abreviaciones_programa[programa]
             else:
                 # Si no hay abreviación, generarla
-                palabras = programa.split()
-                for palabra in palabras:
-                    if palabra.lower() not in ['de', 'en', 'la', 'el', 'los', 'las', 'y']:
-                        prefijo_programa += palabra[0]
+                prefijo_programa = _abreviar_programa(programa)
             
             # Prefijo de rol
             prefijo_rol = rol[0]
@@ -686,23 +1404,15 @@ class RegistroPersonaDialog(QDialog):
             # Obtener año actual para el ID
             año_actual = datetime.now().year % 100  # Solo los dos últimos dígitos
             
-            # Generar parte numérica única (4 dígitos)
-            numero_aleatorio = str(int(datetime.now().timestamp() * 1000) % 10000).zfill(4)
-            
-            # Formato: FACULTAD-PROGRAMA-ROL-AÑO-XXXX
-            id_unico = f"{prefijo_facultad}-{prefijo_programa}-{prefijo_rol}-{año_actual}-{numero_aleatorio}"
-            
-            # Verificar si ya existe este ID en la base de datos
-            id_existente = True
-            while id_existente:
-                id_existente = False
-                for existing_id in self.existing_faces.keys():
-                    if existing_id == id_unico:
-                        id_existente = True
-                        # Cambiar número aleatorio si ya existe
-                        numero_aleatorio = str(int(datetime.now().timestamp() * 1000) % 10000).zfill(4)
-                        id_unico = f"{prefijo_facultad}-{prefijo_programa}-{prefijo_rol}-{año_actual}-{numero_aleatorio}"
-                        break
+            # Parte numérica (4 dígitos): parte de la marca de tiempo y, si el ID ya
+            # existe en la base de datos, avanza de uno en uno
+            numero = int(datetime.now().timestamp() * 1000) % 10000
+            for _ in range(10000):
+                # Formato: FACULTAD-PROGRAMA-ROL-AÑO-XXXX
+                id_unico = f"{prefijo_facultad}-{prefijo_programa}-{prefijo_rol}-{año_actual}-{numero:04d}"
+                if id_unico not in self.existing_ids:
+                    break
+                numero = (numero + 1) % 10000
             
             # Establecer el ID generado
             self.id_input.setText(id_unico)
@@ -736,12 +1446,7 @@ class RegistroPersonaDialog(QDialog):
                 self.programas_por_facultad[facultad_actual] = [programa]
                 
             # Crear una abreviación para el nuevo programa
-            palabras = programa.split()
-            abreviacion = ""
-            for palabra in palabras:
-                if palabra.lower() not in ['de', 'en', 'la', 'el', 'los', 'las', 'y']:
-                    abreviacion += palabra[0]
-            self.abreviaciones_programa[programa] = abreviacion
+            self.abreviaciones_programa[programa] = _abreviar_programa(programa)
     
     def crear_nueva_facultad(self):
         """Crear una nueva facultad."""
@@ -761,12 +1466,7 @@ class RegistroPersonaDialog(QDialog):
             self.facultad_input.setCurrentText(facultad)
             
             # Crear prefijo para la nueva facultad
-            prefijo = ""
-            palabras = facultad.split()
-            for palabra in palabras:
-                if palabra.lower() not in ['de', 'y', 'en', 'la', 'el', 'los', 'las']:
-                    prefijo += palabra[0]
-            self.prefijos_facultad[facultad] = prefijo
+            self.prefijos_facultad[facultad] = _abreviar_programa(facultad)
             
             # Crear estructura de directorios
             try:
@@ -781,26 +1481,44 @@ class RegistroPersonaDialog(QDialog):
             # Solicitar programa inicial
             self.crear_nuevo_programa()
 
-    def update_preview(self):
-        """Actualizar la vista previa de la cámara."""
-        if not hasattr(self, 'camera') or self.camera is None or not self.camera.isOpened():
+    def update_preview(self, frame):
+        """
+        Actualizar la vista previa de la cámara.
+        
+        Args:
+            frame (numpy.ndarray): Frame BGR emitido por el hilo de captura
+        """
+        if getattr(self, 'camera_worker', None) is None:
             return
             
-        ret, frame = self.camera.read()
-        if ret:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+        try:
+            # Algunas cámaras repiten frames por debajo de su FPS nominal; una muestra
+            # de filas basta para detectarlos, ya que el ruido del sensor varía siempre
+            frame_sig = hash(frame[::32].tobytes())
+            if frame_sig == self._last_frame_sig:
+                return
+            self._last_frame_sig = frame_sig
             
-            # Escalar la imagen manteniendo la proporción
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled_pixmap = pixmap.scaled(
-                self.preview_label.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.preview_label.setPixmap(scaled_pixmap)
+            # La etiqueta tiene tamaño fijo: el tamaño de destino solo se recalcula
+            # (y el buffer con su QImage se reserva) cuando cambia la resolución
+            if self._preview_src_shape != frame.shape:
+                h, w, ch = frame.shape
+                scale = min(PREVIEW_WIDTH / w, PREVIEW_HEIGHT / h)
+                dst_w, dst_h = max(1, int(w * scale)), max(1, int(h * scale))
+                self._preview_np = np.empty((dst_h, dst_w, ch), dtype=np.uint8)
+                self._preview_qimg = QImage(self._preview_np.data, dst_w, dst_h, ch * dst_w,
+                                            QImage.Format.Format_BGR888)
+                self._preview_src_shape = frame.shape
+                
+            # Si la cámara entrega el tamaño de la vista previa basta con copiar
+            if self._preview_np.shape == frame.shape:
+                np.copyto(self._preview_np, frame)
+            else:
+                cv2.resize(frame, (self._preview_np.shape[1], self._preview_np.shape[0]),
+                           dst=self._preview_np, interpolation=cv2.INTER_LINEAR)
+            self.preview_label.setPixmap(QPixmap.fromImage(self._preview_qimg))
+        finally:
+            self.camera_worker.frame_consumed()
 
     def check_if_face_exists(self, face_embedding):
         """
@@ -812,23 +1530,23 @@ class RegistroPersonaDialog(QDialog):
         Returns:
             tuple: (existe, datos_persona) o (False, None) si no existe
         """
-        if face_embedding is None or len(self.existing_faces) == 0:
+        if face_embedding is None or not self._emb_ids:
             return False, None
             
         try:
-            threshold = 0.7  # Umbral de similitud
+            # Similitud coseno con todas las personas en una sola operación
+            query = np.asarray(face_embedding, dtype=np.float32).ravel()
+            query = query / np.linalg.norm(query)
+            if self._faiss_index is not None:
+                scores, indices = self._faiss_index.search(query[None, :], 1)
+                best, score = int(indices[0, 0]), float(scores[0, 0])
+            else:
+                scores = self._emb_matrix @ query
+                best = int(scores.argmax())
+                score = float(scores[best])
             
-            for person_id, data in self.existing_faces.items():
-                if 'embedding' in data:
-                    # Calcular distancia (similitud) entre embeddings
-                    embedding_stored = data['embedding']
-                    # Usar np.linalg.norm para calcular la distancia euclidiana
-                    dist = np.linalg.norm(face_embedding - embedding_stored)
-                    # Convertir distancia a similitud [0,1]
-                    similarity = max(0, 1.0 - (dist / 2.0))  
-                    
-                    if similarity > threshold:
-                        return True, data
+            if score > FACE_MATCH_COSINE:
+                return True, self.existing_faces[self._emb_ids[best]]
             
             return False, None
         except Exception as e:
@@ -838,115 +1556,169 @@ class RegistroPersonaDialog(QDialog):
 
     def capturar_foto(self):
         """Capturar una foto desde la cámara."""
-        if not hasattr(self, 'camera') or self.camera is None or not self.camera.isOpened():
+        if getattr(self, 'camera_worker', None) is None:
             QMessageBox.warning(self, "Error", "Cámara no disponible")
             return
             
-        ret, frame = self.camera.read()
-        if ret:
+        # Sin los rostros registrados no se podría detectar un duplicado
+        if self._face_loader is not None and self._face_loader.isRunning():
+            self._show_status("Cargando rostros registrados, intente de nuevo en un momento")
+            return
+            
+        # Una foto a la vez: la anterior aún se está analizando
+        if self._capture_worker is not None and self._capture_worker.isRunning():
+            self._show_status("Procesando la foto anterior, espere un momento")
+            return
+            
+        # La cámara pertenece al hilo de captura; se usa su último frame
+        frame = self.camera_worker.latest_frame()
+        if frame is not None:
             try:
-                # Detectar rostro
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # Evitar procesar fotos casi idénticas a una ya capturada
+                frame_hash = _dhash(frame)
+                if any(bin(frame_hash ^ h).count('1') < 6 for h in self._capture_hashes):
+                    self._show_status("La foto es muy similar a una ya capturada. Intente desde otro ángulo.")
+                    return
                 
-                # Si el padre tiene MTCNN, usarlo
-                mtcnn = None
-                facenet = None
+                # Si el padre tiene MTCNN y FaceNet, analizar la foto en segundo plano
                 parent_widget = self.parent()
-                if parent_widget is not None:
-                    if hasattr(parent_widget, 'mtcnn'):
-                        mtcnn = parent_widget.mtcnn
-                    if hasattr(parent_widget, 'facenet'):
-                        facenet = parent_widget.facenet
-                
-                faces_detected = True
-                face_embedding = None
-                
-                if mtcnn is not None and facenet is not None:
-                    faces = mtcnn(rgb_frame)
-                    if faces is not None:
-                        # Procesar el tensor de rostros
-                        if isinstance(faces, list) and faces:
-                            face_tensor = faces[0]
-                        else:
-                            face_tensor = faces
-    
-                        if face_tensor is not None:
-                            # Normalizar dimensiones
-                            if face_tensor.ndim == 5:
-                                face_tensor = face_tensor.squeeze(0)
-                            if face_tensor.ndim == 4:
-                                face_tensor = face_tensor.squeeze(0)
-                            if face_tensor.ndim == 3:
-                                face_tensor = face_tensor.unsqueeze(0)
-                                
-                            faces_detected = True
-                            
-                            # Extraer embedding para comparar con la base de datos
-                            with torch.no_grad():
-                                embedding = facenet(face_tensor)
-                                face_embedding = embedding.cpu().numpy().flatten()
-                                
-                                # Verificar si el rostro ya existe
-                                existe, datos_persona = self.check_if_face_exists(face_embedding)
-                                if existe:
-                                    # Mostrar mensaje de que la persona ya existe
-                                    msg = f"⚠️ El rostro detectado ya existe en la base de datos:\n\n"
-                                    msg += f"Nombre: {datos_persona.get('nombre', 'N/A')}\n"
-                                    msg += f"Facultad: {datos_persona.get('facultad', 'N/A')}\n"
-                                    msg += f"Programa: {datos_persona.get('programa', 'N/A')}\n\n"
-                                    msg += "¿Desea continuar con el registro de todas formas?"
-                                    
-                                    reply = QMessageBox.question(
-                                        self, "Rostro Duplicado", msg,
-                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                        QMessageBox.StandardButton.No
-                                    )
-                                    
-                                    if reply == QMessageBox.StandardButton.No:
-                                        return
-                    else:
-                        faces_detected = False
-                
-                if faces_detected:
-                    # Guardar la imagen
-                    self.captured_images.append(frame.copy())  # Usar .copy() para evitar problemas de referencias
-                    self.counter_label.setText(f"Fotos capturadas: {len(self.captured_images)}/5")
-                    
-                    # Crear y mostrar miniatura
-                    h, w, ch = frame.shape
-                    bytes_per_line = ch * w
-                    qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_BGR888)
-                    pixmap = QPixmap.fromImage(qt_image).scaled(
-                        100, 100, 
-                        Qt.AspectRatioMode.KeepAspectRatio, 
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    
-                    thumb_label = QLabel()
-                    thumb_label.setPixmap(pixmap)
-                    thumb_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-                    self.thumbnails_layout.addWidget(thumb_label)
-                    
-                    # Habilitar guardado si hay suficientes fotos
-                    if len(self.captured_images) >= 5:
-                        self.guardar_btn.setEnabled(True)
-                        self.info_label.setText("¡Listo para guardar!")
-                        self.info_label.setStyleSheet("color: #006633; font-size: 14px; font-weight: bold;")
+                mtcnn = getattr(parent_widget, 'mtcnn', None)
+                facenet = getattr(parent_widget, 'facenet', None)
+                if mtcnn is None or facenet is None:
+                    self._store_capture(frame, frame_hash)
+                    return
                     
-                    # Efecto de flash
-                    flash = QLabel(self.preview_label)
-                    flash.resize(self.preview_label.size())
-                    flash.setStyleSheet("background-color: rgba(255, 255, 255, 0.7);")
-                    flash.show()
-                    QTimer.singleShot(100, flash.deleteLater)
-                else:
-                    QMessageBox.warning(self, "Advertencia", "No se detectó ningún rostro en la imagen")
+                self._capture_worker = CaptureFaceWorker(frame, frame_hash, mtcnn, facenet, self)
+                self._capture_worker.face_analyzed.connect(self.on_capture_analyzed)
+                self._capture_worker.failed.connect(self.on_capture_failed)
+                self._capture_worker.finished.connect(self._on_worker_finished)
+                self._capture_worker.start()
             
             except Exception as e:
                 print(f"Error al capturar foto: {str(e)}")
                 traceback.print_exc()
                 QMessageBox.warning(self, "Error", f"Error al procesar la imagen: {str(e)}")
 
+    def _on_worker_finished(self):
+        """Libera un hilo terminado; el diálogo sigue vivo como hijo de la ventana principal."""
+        worker = self.sender()
+        if worker is self._capture_worker:
+            self._capture_worker = None
+        elif worker is self._face_loader:
+            self._face_loader = None
+        worker.deleteLater()
+
+    def on_capture_analyzed(self, frame, frame_hash, face_embedding):
+        """
+        Recibe el resultado de CaptureFaceWorker y guarda la foto si corresponde.
+        
+        Args:
+            frame (numpy.ndarray): Frame BGR capturado
+            frame_hash (int): dHash del frame
+            face_embedding (numpy.ndarray): Embedding del rostro, o None si no se detectó
+        """
+        if not self.isVisible():
+            return  # El diálogo se cerró mientras se analizaba la foto
+        if face_embedding is None:
+            self._show_status("No se detectó ningún rostro en la imagen")
+            return
+            
+        # Verificar si el rostro ya existe
+        existe, datos_persona = self.check_if_face_exists(face_embedding)
+        if existe:
+            # Mostrar mensaje de que la persona ya existe
+            msg = f"⚠️ El rostro detectado ya existe en la base de datos:\n\n"
+            msg += f"Nombre: {datos_persona.get('nombre', 'N/A')}\n"
+            msg += f"Facultad: {datos_persona.get('facultad', 'N/A')}\n"
+            msg += f"Programa: {datos_persona.get('programa', 'N/A')}\n\n"
+            msg += "¿Desea continuar con el registro de todas formas?"
+            
+            reply = QMessageBox.question(
+                self, "Rostro Duplicado", msg,
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            
+            if reply == QMessageBox.StandardButton.No:
+                return
+                
+        self._store_capture(frame, frame_hash)
+
+    def on_capture_failed(self, error):
+        """
+        Informa de un error al analizar una foto en CaptureFaceWorker.
+        
+        Args:
+            error (str): Descripción del error
+        """
+        if not self.isVisible():
+            return
+        QMessageBox.warning(self, "Error", f"Error al procesar la imagen: {error}")
+
+    def _store_capture(self, frame, frame_hash):
+        """
+        Guarda una foto aceptada y actualiza el panel de capturas.
+        
+        Args:
+            frame (numpy.ndarray): Frame BGR capturado
+            frame_hash (int): dHash del frame
+        """
+        # Guardar la imagen
+        self.captured_images.append(_encode_jpeg(frame))
+        self._capture_hashes.append(frame_hash)
+        self.counter_label.setText(f"Fotos capturadas: {len(self.captured_images)}/5")
+        
+        # Crear y mostrar miniatura
+        self.add_thumbnail(frame)
+        
+        # Habilitar guardado si hay suficientes fotos
+        if len(self.captured_images) >= 5:
+            self.guardar_btn.setEnabled(True)
+            self.info_label.setText("¡Listo para guardar!")
+            self.info_label.setStyleSheet("color: #006633; font-size: 14px; font-weight: bold;")
+        
+        # Efecto de flash
+        self.flash_label.show()
+        QTimer.singleShot(100, self.flash_label.hide)
+
+    def _show_status(self, text, duration=3000):
+        """
+        Muestra un aviso temporal en la etiqueta de información sin bloquear la vista previa.
+        
+        Args:
+            text (str): Mensaje a mostrar
+            duration (int): Milisegundos antes de restaurar el texto anterior
+        """
+        previous = self.info_label.text()
+        self.info_label.setText(text)
+        
+        def restore():
+            # No pisar un mensaje más reciente
+            if self.info_label.text() == text:
+                self.info_label.setText(previous)
+                
+        QTimer.singleShot(duration, restore)
+
+    def add_thumbnail(self, image, size=100):
+        """
+        Añade la miniatura de una imagen al panel de fotos capturadas.
+        
+        Args:
+            image (numpy.ndarray): Imagen BGR
+            size (int): Tamaño máximo del lado mayor de la miniatura
+            
+        Returns:
+            QPixmap: Miniatura añadida
+        """
+        # Las fotos de la cámara tienen siempre el mismo tamaño: se reutiliza un
+        # único buffer, ya que QPixmap.fromImage copia los píxeles
+        tw, th = _thumbnail_size(*image.shape[:2], size)
+        if self._thumb_buf is None or self._thumb_buf.shape[:2] != (th, tw):
+            self._thumb_buf = np.empty((th, tw, 3), dtype=np.uint8)
+        pixmap = _thumbnail_pixmap(image, size, self._thumb_buf)
+        self.thumbnails_model.append_pixmaps([pixmap])
+        return pixmap
+
     def load_existing_dataset(self):
         """Cargar un dataset existente de imágenes."""
         try:
@@ -957,9 +1729,10 @@ class RegistroPersonaDialog(QDialog):
             
             if dataset_dir:
                 # Verificar si el directorio contiene imágenes
-                valid_extensions = ('.jpg', '.jpeg', '.png')
-                image_files = [f for f in os.listdir(dataset_dir) 
-                             if f.lower().endswith(valid_extensions)]
+                with os.scandir(dataset_dir) as entries:
+                    image_files = [e.name for e in entries
+                                   if os.path.splitext(e.name)[1].lower() in VALID_EXTENSIONS
+                                   and e.is_file()]
                 
                 if not image_files:
                     QMessageBox.warning(self, "Error", 
@@ -967,57 +1740,68 @@ class RegistroPersonaDialog(QDialog):
                     return
                     
                 # Limpiar imágenes existentes
-                for i in reversed(range(self.thumbnails_layout.count())): 
-                    widget = self.thumbnails_layout.itemAt(i).widget()
-                    if widget:
-                        widget.setParent(None)
+                self.thumbnails_model.clear()
                 self.captured_images.clear()
+                self._capture_hashes.clear()
+                
+                # Pausar la vista previa mientras el diálogo de progreso la cubre
+                self.pause_preview()
+                
+                # Limitar a cargar máximo 10 imágenes para mejor rendimiento
+                max_images = min(10, len(image_files))
                 
                 # Mostrar diálogo de progreso
-                progress = QProgressDialog("Cargando imágenes...", "Cancelar", 0, len(image_files), self)
+                progress = QProgressDialog("Cargando imágenes...", "Cancelar", 0, max_images, self)
                 progress.setWindowModality(Qt.WindowModality.WindowModal)
                 progress.setMinimumDuration(0)
                 progress.setValue(0)
                 
-                # Limitar a cargar máximo 10 imágenes para mejor rendimiento
-                max_images = min(10, len(image_files))
+                # Decodificar las imágenes en paralelo; el progreso avanza según terminan
+                paths = [os.path.join(dataset_dir, f) for f in image_files[:max_images]]
+                images = [None] * len(paths)
                 
-                # Cargar las imágenes
-                for i, img_file in enumerate(image_files[:max_images]):
-                    if progress.wasCanceled():
-                        break
-                        
-                    img_path = os.path.join(dataset_dir, img_file)
-                    img = cv2.imread(img_path)
-                    if img is not None:
-                        # Reducir tamaño si es muy grande
-                        if img.shape[0] > 800 or img.shape[1] > 800:
-                            ratio = min(800 / img.shape[0], 800 / img.shape[1])
-                            new_size = (int(img.shape[1] * ratio), int(img.shape[0] * ratio))
-                            img = cv2.resize(img, new_size)
-                            
-                        self.captured_images.append(img)
-                        
-                        # Crear y mostrar miniatura
-                        h, w, ch = img.shape
-                        bytes_per_line = ch * w
-                        qt_image = QImage(img.data, w, h, bytes_per_line, 
-                                        QImage.Format.Format_BGR888)
-                        pixmap = QPixmap.fromImage(qt_image).scaled(
-                            100, 100, 
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                            Qt.TransformationMode.SmoothTransformation
-                        )
-                        
-                        thumb_label = QLabel()
-                        thumb_label.setPixmap(pixmap)
-                        thumb_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-                        self.thumbnails_layout.addWidget(thumb_label)
+                # Las miniaturas de archivos ya cargados antes salen de QPixmapCache
+                cache_keys = [_thumbnail_cache_key(path) for path in paths]
+                cached = [QPixmapCache.find(key) for key in cache_keys]
+                try:
+                    executor = self._get_io_pool()
+                    # Cada setValue repinta el diálogo; con muchas imágenes se agrupan
+                    progress_step = max(1, len(paths) // PROGRESS_UPDATES)
+                    futures = {
+                        executor.submit(_load_dataset_image, path,
+                                        with_thumbnail=pixmap is None or pixmap.isNull()): i
+                        for i, (path, pixmap) in enumerate(zip(paths, cached))
+                    }
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        if progress.wasCanceled():
+                            for pending in futures:
+                                pending.cancel()
+                            break
+                        i = futures[future]
+                        try:
+                            images[i] = future.result()
+                        except Exception as e:
+                            # Archivo ilegible o imagen corrupta: se omite como si no cargara
+                            print(f"No se pudo cargar {paths[i]}: {str(e)}")
+                        if done % progress_step == 0:
+                            progress.setValue(done)
                     
-                    progress.setValue(i + 1)
-                
-                # Cerrar diálogo de progreso
-                progress.setValue(len(image_files))
+                    # Solo los QPixmap se crean en el hilo principal, en el orden original,
+                    # y se insertan en el modelo de una sola vez
+                    pixmaps = []
+                    for loaded, key, pixmap in zip(images, cache_keys, cached):
+                        if loaded is not None:
+                            thumb, data = loaded
+                            self.captured_images.append(data)
+                            if thumb is not None:
+                                pixmap = _thumbnail_pixmap(thumb)
+                                QPixmapCache.insert(key, pixmap)
+                            pixmaps.append(pixmap)
+                    self.thumbnails_model.append_pixmaps(pixmaps)
+                finally:
+                    # Cerrar diálogo de progreso aunque algo falle
+                    progress.setValue(max_images)
+                    self.resume_preview()
                 
                 # Actualizar contador
                 self.counter_label.setText(
@@ -1039,12 +1823,16 @@ class RegistroPersonaDialog(QDialog):
         """Guardar datos de la persona y sus fotos."""
         if not self.validate_inputs():
             return
+        nombre = self._validated_fields["nombre"]
+        facultad = self._validated_fields["facultad"]
+        programa = self._validated_fields["programa"]
 
-        # Verificar si el ID ya existe
+        # Verificar si el ID ya existe; existing_ids está completo desde __init__,
+        # mientras que existing_faces se llena en segundo plano y omite fotos sin rostro
         id_persona = self.id_input.text().strip()
-        if id_persona in self.existing_faces:
+        if id_persona in self.existing_ids:
             mensaje = f"El ID '{id_persona}' ya existe en la base de datos.\n"
-            mensaje += f"Pertenece a: {self.existing_faces[id_persona].get('nombre', 'N/A')}\n"
+            mensaje += f"Pertenece a: {self.existing_ids[id_persona] or 'N/A'}\n"
             mensaje += "¿Desea generar un nuevo ID automáticamente?"
             
             reply = QMessageBox.question(
@@ -1059,24 +1847,29 @@ class RegistroPersonaDialog(QDialog):
             else:
                 return
 
+        staging_path = None
         try:
             # Asegurarse de que existe el directorio base
             os.makedirs(BASE_PATH, exist_ok=True)
             
             # Crear estructura de directorios
-            facultad_path = os.path.join(BASE_PATH, self.facultad_input.currentText())
+            facultad_path = os.path.join(BASE_PATH, facultad)
             os.makedirs(facultad_path, exist_ok=True)
             
-            person_path = os.path.join(facultad_path, self.nombre_input.text())
+            person_path = os.path.join(facultad_path, nombre)
             if os.path.exists(person_path):
                 if QMessageBox.question(self, "Confirmar", 
                     "Ya existe una persona con este nombre. ¿Desea sobrescribir?",
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.No:
                     return
-                shutil.rmtree(person_path)
             
-            os.makedirs(person_path, exist_ok=True)
+            # Escribir en un directorio temporal de la misma facultad (mismo sistema de
+            # archivos); la carpeta de la persona aparece completa con un solo renombrado
+            staging_path = tempfile.mkdtemp(prefix=".registro_", dir=facultad_path)
 
+            # Pausar la vista previa mientras el diálogo de progreso la cubre
+            self.pause_preview()
+            
             # Mostrar diálogo de progreso
             progress = QProgressDialog("Procesando imágenes...", "Cancelar", 0, len(self.captured_images), self)
             progress.setWindowModality(Qt.WindowModality.WindowModal)
@@ -1087,23 +1880,40 @@ class RegistroPersonaDialog(QDialog):
             saved_images = 0
             print("Procesando imágenes para guardar...")
             
-            for i, image in enumerate(self.captured_images):
+            # Las fotos ya están en JPEG; se escriben en paralelo sin recodificar
+            executor = self._get_io_pool()
+            futures = {
+                executor.submit(_write_jpeg, os.path.join(staging_path, f"foto_{i+1}.jpg"), data): i
+                for i, data in enumerate(self.captured_images)
+            }
+            
+            # El progreso avanza según terminan las escrituras, no en orden,
+            # y se repinta como mucho PROGRESS_UPDATES veces
+            progress_step = max(1, len(futures) // PROGRESS_UPDATES)
+            for done, future in enumerate(as_completed(futures), start=1):
                 if progress.wasCanceled():
-                    break
+                    # No publicar un registro a medias: finally borra el directorio
+                    # temporal y el registro anterior queda intacto
+                    for pending in futures:
+                        pending.cancel()
+                    # Esperar las escrituras ya empezadas para que no compitan con el borrado
+                    wait(futures)
+                    progress.setValue(len(self.captured_images))
+                    return
                     
+                i = futures[future]
                 try:
-                    # Guardar imagen original
-                    img_path = os.path.join(person_path, f"foto_{i+1}.jpg")
-                    cv2.imwrite(img_path, image)
-                    saved_images += 1
-                    print(f"Imagen {i+1} guardada exitosamente")
-                    
+                    if future.result():
+                        saved_images += 1
+                        print(f"Imagen {i+1} guardada exitosamente")
+                    else:
+                        print(f"No se pudo guardar la imagen {i+1}")
                 except Exception as e:
                     print(f"Error al procesar imagen {i+1}: {str(e)}")
                     traceback.print_exc()
-                    continue
                     
-                progress.setValue(i + 1)
+                if done % progress_step == 0:
+                    progress.setValue(done)
 
             # Cerrar diálogo de progreso
             progress.setValue(len(self.captured_images))
@@ -1113,31 +1923,56 @@ class RegistroPersonaDialog(QDialog):
                 return
 
             # Obtener semestre si es estudiante
+            campos = self._validated_fields
             semestre = ""
-            if self.rol_input.currentText() == "Estudiante":
+            if campos["rol"] == "Estudiante":
                 semestre = self.semestre_input.currentText()
 
             # Crear un diccionario con los datos de la persona
             person_dict = {
-                "nombre": self.nombre_input.text(),
+                "nombre": nombre,
                 "id": id_persona,  # Usar el ID validado
-                "facultad": self.facultad_input.currentText(),
-                "programa": self.programa_input.currentText(),
-                "rol": self.rol_input.currentText(),
-                "tipo": self.tipo_acceso.currentText(),
-                "sede": self.sede_input.currentText(),
-                "extension": self.extension_input.currentText(),
+                "facultad": facultad,
+                "programa": programa,
+                **{clave: campos[clave] for clave, _ in self._CAMPOS_SELECCION},
                 "semestre": semestre,
                 "fecha_registro": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             
             # Guardar metadata como JSON
-            metadata_path = os.path.join(person_path, "info.json")
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(person_dict, f, indent=4, ensure_ascii=False)
+            metadata_path = os.path.join(staging_path, "info.json")
+            if orjson is not None:
+                metadata = orjson.dumps(person_dict, option=orjson.OPT_INDENT_2)
+            else:
+                # Serializar en memoria: json.dump escribe cada token por separado
+                metadata = json.dumps(person_dict, indent=4, ensure_ascii=False).encode('utf-8')
+            with open(metadata_path, 'wb') as f:
+                f.write(metadata)
             
             print("Metadata guardada exitosamente")
             
+            # Publicar el registro: la carpeta anterior se aparta con un renombrado y solo
+            # se descarta cuando la nueva ya está en su sitio; si falla, se restaura
+            apartado = None
+            if os.path.exists(person_path):
+                apartado = tempfile.mkdtemp(prefix=".registro_anterior_", dir=facultad_path)
+                os.replace(person_path, os.path.join(apartado, "old"))
+            try:
+                os.replace(staging_path, person_path)
+            except OSError:
+                if apartado is not None:
+                    os.replace(os.path.join(apartado, "old"), person_path)
+                    os.rmdir(apartado)
+                raise
+            staging_path = None
+            if apartado is not None:
+                self._discard_directory(apartado)
+            
+            # Las fotos ya están en disco: liberarlas antes de los diálogos finales,
+            # ya que el diálogo sigue vivo como hijo de la ventana principal
+            self.captured_images.clear()
+            self._capture_hashes.clear()
+            
             # Intentar crear el objeto UniversityPersonData si la clase está disponible
             try:
                 from data.person import UniversityPersonData
@@ -1148,10 +1983,10 @@ class RegistroPersonaDialog(QDialog):
                 
             # Mensaje de éxito con detalles
             mensaje = f"Persona registrada correctamente\n\n"
-            mensaje += f"Nombre: {self.nombre_input.text()}\n"
+            mensaje += f"Nombre: {nombre}\n"
             mensaje += f"ID: {id_persona}\n"
-            mensaje += f"Facultad: {self.facultad_input.currentText()}\n"
-            mensaje += f"Programa: {self.programa_input.currentText()}\n"
+            mensaje += f"Facultad: {facultad}\n"
+            mensaje += f"Programa: {programa}\n"
             mensaje += f"Imágenes guardadas: {saved_images}\n"
             
             QMessageBox.information(self, "Registro Exitoso", mensaje)
@@ -1161,10 +1996,26 @@ class RegistroPersonaDialog(QDialog):
             print(f"Error al guardar persona: {str(e)}")
             traceback.print_exc()
             QMessageBox.critical(self, "Error", f"Error al guardar: {str(e)}")
+        finally:
+            if staging_path is not None:
+                shutil.rmtree(staging_path, ignore_errors=True)
+            self.resume_preview()
 
     def validate_inputs(self):
-        """Validar que todos los campos requeridos estén completos."""
-        if not self.nombre_input.text().strip():
+        """
+        Validar que todos los campos requeridos estén completos.
+        
+        Los textos leídos quedan en self._validated_fields para que
+        guardar_persona no vuelva a consultar los widgets.
+        
+        Returns:
+            bool: True si el formulario es válido
+        """
+        nombre = self.nombre_input.text()
+        facultad = self.facultad_input.currentText()
+        programa = self.programa_input.currentText()
+        
+        if not nombre.strip():
             QMessageBox.warning(self, "Error", "El nombre es obligatorio")
             self.nombre_input.setFocus()
             return False
@@ -1174,12 +2025,12 @@ class RegistroPersonaDialog(QDialog):
             self.id_input.setFocus()
             return False
         
-        if not self.facultad_input.currentText().strip():
+        if not facultad.strip():
             QMessageBox.warning(self, "Error", "La facultad es obligatoria")
             self.facultad_input.setFocus()
             return False
         
-        if not self.programa_input.currentText().strip():
+        if not programa.strip():
             QMessageBox.warning(self, "Error", "El programa académico es obligatorio")
             self.programa_input.setFocus()
             return False
@@ -1188,18 +2039,85 @@ class RegistroPersonaDialog(QDialog):
             QMessageBox.warning(self, "Error", "Se requieren al menos 5 fotos")
             return False
         
+        self._validated_fields = {"nombre": nombre, "facultad": facultad, "programa": programa}
+        for clave, combo in self._CAMPOS_SELECCION:
+            self._validated_fields[clave] = getattr(self, combo).currentText()
         return True
 
+    def pause_preview(self):
+        """Deja de mostrar frames sin detener la captura."""
+        if getattr(self, 'camera_worker', None) is not None:
+            self.camera_worker.set_emitting(False)
+
+    def resume_preview(self):
+        """Reanuda la vista previa si el diálogo está visible y hay cámara."""
+        if self.isVisible() and getattr(self, 'camera_worker', None) is not None:
+            self.camera_worker.set_emitting(True)
+
+    def showEvent(self, event):
+        """Reanuda la vista previa al mostrar el diálogo."""
+        super().showEvent(event)
+        self.resume_preview()
+
+    def hideEvent(self, event):
+        """Pausa la vista previa mientras el diálogo no es visible."""
+        self.pause_preview()
+        super().hideEvent(event)
+
+    def release_camera(self):
+        """Detiene la vista previa y libera la cámara."""
+        if getattr(self, 'camera_worker', None) is not None:
+            self.camera_worker.stop()
+            # La cámara la abrió el hilo; ya detenido, se puede liberar aquí
+            if self.camera_worker.camera is not None:
+                self.camera_worker.camera.release()
+            self.camera_worker = None
+
+    def _discard_directory(self, path):
+        """
+        Elimina en el pool de E/S un directorio ya apartado, sin bloquear la interfaz.
+        
+        Se espera un directorio oculto (.registro_anterior_*), que los cargadores
+        omiten, así que no hace falta moverlo antes de borrarlo.
+        
+        Args:
+            path (str): Directorio a eliminar
+        """
+        self._get_io_pool().submit(shutil.rmtree, path, ignore_errors=True)
+
+    def _get_io_pool(self):
+        """
+        Devuelve el pool de hilos para decodificar y escribir imágenes, creándolo al primer uso.
+        
+        Returns:
+            ThreadPoolExecutor: Pool compartido por la carga del dataset y el guardado
+        """
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self._io_pool
+
+    def done(self, result):
+        """Libera la cámara también al aceptar o cancelar el diálogo."""
+        self.release_camera()
+        if self._face_loader is not None:
+            self._face_loader.requestInterruption()
+            self._face_loader.wait()
+            self._face_loader = None
+        if self._capture_worker is not None:
+            self._capture_worker.wait()
+            self._capture_worker = None
+        if self._io_pool is not None:
+            # Sin cancelar: puede quedar pendiente el borrado de un directorio apartado
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+        super().done(result)
+
     def closeEvent(self, event):
         """Limpiar recursos al cerrar el diálogo."""
-        self.timer.stop()
-        if hasattr(self, 'camera') and self.camera is not None:
-            self.camera.release()
-            self.camera = None
+        self.release_camera()
         
-        # Liberar memoria
+        # Liberar memoria; las fotos son bytes sin ciclos, el conteo de referencias basta
         self.captured_images.clear()
-        gc.collect()
         
         # Llamar al evento original
         super().closeEvent(event)
\ No newline at end of file
@@ -3,7 +3,9 @@
 
 import cv2
 import platform
+import threading
 import time
+from PyQt6.QtCore import QThread, pyqtSignal
 
 def open_fastest_webcam(camera_index=0, resolution=(1280, 720), target_fps=30):
     """
@@ -25,14 +27,23 @@ def open_fastest_webcam(camera_index=0, resolution=(1280, 720), target_fps=30):
         # En Windows, DirectShow es mucho más rápido
         cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
         print("Usando backend DirectShow para máxima velocidad")
+    elif platform.system() == 'Linux':
+        # V4L2 directo evita que OpenCV elija GStreamer, que no respeta el FOURCC pedido
+        cap = cv2.VideoCapture(camera_index, cv2.CAP_V4L2)
     else:
-        # En Linux/Mac
+        # En Mac
         cap = cv2.VideoCapture(camera_index)
     
     if not cap.isOpened():
         print("Error: No se pudo abrir la cámara")
         return None
     
+    # Solicitar MJPEG: la cámara comprime en el dispositivo y el USB transfiere menos datos
+    mjpg = cv2.VideoWriter_fourcc(*'MJPG')
+    cap.set(cv2.CAP_PROP_FOURCC, mjpg)
+    if int(cap.get(cv2.CAP_PROP_FOURCC)) != mjpg:
+        print("La cámara no admite MJPEG, se usa su formato predeterminado")
+    
     # Configurar para máxima velocidad
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
@@ -87,4 +98,88 @@ def get_available_cameras(max_cameras=10):
             print(f"Error al verificar cámara {i}: {str(e)}")
             
     # Filtrar solo las cámaras disponibles
-    return [cam for cam in available_cameras if cam[2]]
\ No newline at end of file
+    return [cam for cam in available_cameras if cam[2]]
+
+class CameraWorker(QThread):
+    """Hilo que lee la cámara de forma continua y conserva solo el último frame."""
+    
+    frame_ready = pyqtSignal(object)
+    camera_failed = pyqtSignal()
+    
+    def __init__(self, camera, parent=None, opener=None):
+        """
+        Inicializa el hilo de captura.
+        
+        Args:
+            camera (cv2.VideoCapture): Cámara ya abierta, o None si la abre el hilo
+            parent: Objeto padre para la jerarquía de Qt
+            opener (callable): Función que abre la cámara dentro del hilo, para no
+                bloquear la interfaz mientras el driver enumera dispositivos
+        """
+        super().__init__(parent)
+        self.camera = camera
+        self._opener = opener
+        self.running = True  # stop() puede llegar antes de que arranque run()
+        self._lock = threading.Lock()
+        self._latest = None
+        self._emitting = True
+        self._pending = False  # Hay un frame emitido que aún no se ha mostrado
+        
+    def run(self):
+        """Lee frames mientras el hilo esté activo, descartando los antiguos."""
+        if self.camera is None and self._opener is not None:
+            self.camera = self._opener()
+            if self.camera is not None and not self.camera.isOpened():
+                self.camera.release()
+                self.camera = None
+            if self.camera is None:
+                self.camera_failed.emit()
+                return
+                
+        while self.running:
+            if not self.camera.grab():
+                time.sleep(0.01)
+                continue
+            ret, frame = self.camera.retrieve()
+            if ret:
+                with self._lock:
+                    self._latest = frame
+                    # No encolar más frames mientras la UI no haya mostrado el anterior
+                    emit = self._emitting and not self._pending
+                    if emit:
+                        self._pending = True
+                if emit:
+                    self.frame_ready.emit(frame)
+                    
+    def frame_consumed(self):
+        """Indica que el último frame emitido ya fue procesado por la UI."""
+        with self._lock:
+            self._pending = False
+            
+    def set_emitting(self, enabled):
+        """
+        Activa o pausa la emisión de frames sin detener la captura.
+        
+        Args:
+            enabled (bool): True para emitir frame_ready, False para pausar
+        """
+        with self._lock:
+            self._emitting = enabled
+            self._pending = False
+                    
+    def latest_frame(self):
+        """
+        Obtiene el frame más reciente.
+        
+        Returns:
+            numpy.ndarray: Último frame capturado o None si aún no hay ninguno
+        """
+        with self._lock:
+            # retrieve() entrega un array nuevo en cada lectura, así que el
+            # frame publicado no se vuelve a modificar y no hace falta copiarlo
+            return self._latest
+            
+    def stop(self):
+        """Detiene el hilo de captura."""
+        self.running = False
+        self.wait()
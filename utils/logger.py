@@ -3,12 +3,16 @@
 
 from datetime import datetime
 from PyQt6.QtWidgets import QTextEdit, QFileDialog
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
 from PyQt6.QtGui import QTextCharFormat, QColor, QTextCursor
 from config.constants import MAX_LOG_ENTRIES
 
-class Logger:
+class Logger(QObject):
     """Clase para gestionar logs de la aplicación."""
     
+    # Señal que entrega los mensajes al hilo de la UI
+    entry_ready = pyqtSignal(str, str)
+    
     def __init__(self, log_widget=None):
         """
         Inicializa el logger.
@@ -16,8 +20,12 @@ class Logger:
         Args:
             log_widget (QTextEdit): Widget donde mostrar los logs
         """
+        super().__init__()
         self.log_widget = log_widget
         
+        # La conexión en cola difiere la escritura en el widget al bucle de la UI
+        self.entry_ready.connect(self._append_entry, Qt.ConnectionType.QueuedConnection)
+        
     def set_log_widget(self, log_widget):
         """
         Establece el widget de log.
@@ -29,9 +37,19 @@ class Logger:
         
     def log_message(self, message):
         """
-        Registra un mensaje en el log.
+        Registra un mensaje en el log sin bloquear el hilo que lo llama.
+        
+        Args:
+            message (str): Mensaje a registrar
+        """
+        self.entry_ready.emit(datetime.now().strftime("%H:%M:%S"), message)
+            
+    def _append_entry(self, timestamp, message):
+        """
+        Añade una entrada al widget de log (se ejecuta en el hilo de la UI).
         
         Args:
+            timestamp (str): Hora en la que se registró el mensaje
             message (str): Mensaje a registrar
         """
         try:
@@ -39,7 +57,6 @@ class Logger:
                 print(message)
                 return
                 
-            timestamp = datetime.now().strftime("%H:%M:%S")
             self.log_widget.append(f"[{timestamp}] {message}")
             
             # Mantener el tamaño del log limitado